@@ -134,13 +134,16 @@ async def get_logo():
         # Return a default response if logo file not found
         raise HTTPException(status_code=404, detail="Logo not found")
 
+def _load_manifest():
+    """Read the plugin manifest from the .well-known directory"""
+    with open(os.path.join(os.path.dirname(__file__), ".well-known/ai-plugin.json"), "r") as f:
+        return json.load(f)
+
 @app.get("/.well-known/ai-plugin.json")
 async def get_plugin_manifest():
     """Return the plugin manifest for OpenAI plugins"""
     try:
-        with open(os.path.join(os.path.dirname(__file__), ".well-known/ai-plugin.json"), "r") as f:
-            manifest = json.load(f)
-        return JSONResponse(content=manifest)
+        return JSONResponse(content=_load_manifest())
     except Exception as e:
         logger.exception(f"Error loading plugin manifest: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to load plugin manifest")
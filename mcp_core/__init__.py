@@ -1,6 +1,11 @@
 """
 MCP (Model Context Protocol) module for diagram generation.
 """
+from mcp_core.__version__ import __version__
 
-# Import submodules for easier access
-from mcp_core.core.config import MCP_SETTINGS
\ No newline at end of file
+def __getattr__(name):
+    # Settings are loaded on first access so importing the package stays side-effect free
+    if name == "MCP_SETTINGS":
+        from mcp_core.core.config import MCP_SETTINGS
+        return MCP_SETTINGS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,4 @@
+"""
+Version of the UML-MCP server, kept free of imports so it can be read cheaply.
+"""
+__version__ = "1.2.0"
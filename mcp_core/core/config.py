@@ -6,6 +6,8 @@ import os
 from typing import Dict, List
 from pydantic import BaseModel
 
+from mcp_core.__version__ import __version__
+
 class DiagramType(BaseModel):
     """Configuration for a diagram type"""
     backend: str
@@ -15,7 +17,7 @@ class DiagramType(BaseModel):
 class MCPSettings(BaseModel):
     """Configuration settings for MCP server"""
     server_name: str = "UML Diagram Generator"
-    version: str = "1.2.0"
+    version: str = __version__
     description: str = "Generate UML and other diagrams through MCP"
     output_dir: str = os.environ.get("MCP_OUTPUT_DIR", os.path.join(os.getcwd(), "output"))
     tools: List[str] = []
@@ -24,6 +26,7 @@ class MCPSettings(BaseModel):
     diagram_types: Dict[str, DiagramType] = {}
     plantuml_server: str = os.environ.get("PLANTUML_SERVER", "http://plantuml-server:8080")
     kroki_server: str = os.environ.get("KROKI_SERVER", "https://kroki.io")
+    eager_resources: bool = os.environ.get("MCP_EAGER_RESOURCES", "true").lower() == "true"
 
 # Define supported diagram types with their backends
 DIAGRAM_TYPES = {
@@ -97,6 +100,30 @@ MCP_SETTINGS = MCPSettings(
     diagram_types=DIAGRAM_TYPES
 )
 
+# Rows cached for the diagram_types mapping they were built from
+_diagram_type_rows = (None, ())
+
+def get_diagram_type_rows():
+    """
+    Get flattened (name, backend, description, formats) rows of the configured diagram types
+    
+    Rows are built from MCP_SETTINGS.diagram_types and rebuilt when the
+    mapping is replaced, so every consumer sees the same set of types.
+    
+    Returns:
+        Tuple of (name, backend, description, formats) tuples
+    """
+    global _diagram_type_rows
+    diagram_types = MCP_SETTINGS.diagram_types
+    source, rows = _diagram_type_rows
+    if source is not diagram_types:
+        rows = tuple(
+            (name, config.backend, config.description, config.formats)
+            for name, config in diagram_types.items()
+        )
+        _diagram_type_rows = (diagram_types, rows)
+    return rows
+
 # Configure local Kroki server if available
 if os.environ.get("USE_LOCAL_KROKI", "false").lower() == "true":
     MCP_SETTINGS.kroki_server = os.environ.get("KROKI_SERVER", "http://kroki:8000")
@@ -6,13 +6,18 @@ import os
 import logging
 import json
 import datetime
+import threading
 from typing import Dict, Optional, Any, List
 
 # Get logger
 logger = logging.getLogger(__name__)
 
+# Supported server transports
+_TRANSPORTS = ("stdio", "http")
+
 # Create a singleton MCP server instance
 _mcp_server = None
+_mcp_server_lock = threading.Lock()
 
 def create_mcp_server():
     """Create and configure the MCP server with all tools and resources.
@@ -28,20 +33,22 @@ def create_mcp_server():
     from ..prompts.diagram_prompts import register_diagram_prompts
     
     # Initialize MCP server
-    logger.info(f"Creating MCP server: {MCP_SETTINGS.server_name}")
+    logger.info("Creating MCP server: %s", MCP_SETTINGS.server_name)
     server = FastMCP(MCP_SETTINGS.server_name)
     
-    # Register all tools, resources, and prompts
+    # Register all tools, prompts, and resources. Resources go last since
+    # they may be precomputed from the registered tools and prompts.
     tool_names = register_diagram_tools(server)
-    resource_names = register_diagram_resources(server)
     prompt_names = register_diagram_prompts(server)
+    resource_names = register_diagram_resources(server)
     
     # Update settings with registered tools and prompts
     MCP_SETTINGS.tools = tool_names
     MCP_SETTINGS.prompts = prompt_names
     MCP_SETTINGS.resources = resource_names
     
-    logger.info(f"MCP server created with {len(MCP_SETTINGS.tools)} tools, {len(MCP_SETTINGS.prompts)} prompts, and {len(MCP_SETTINGS.resources)} resources")
+    logger.info("MCP server created with %d tools, %d prompts, and %d resources",
+                len(MCP_SETTINGS.tools), len(MCP_SETTINGS.prompts), len(MCP_SETTINGS.resources))
     return server
 
 def get_mcp_server():
@@ -52,7 +59,10 @@ def get_mcp_server():
     """
     global _mcp_server
     if _mcp_server is None:
-        _mcp_server = create_mcp_server()
+        with _mcp_server_lock:
+            # Re-check so concurrent callers don't create a second server
+            if _mcp_server is None:
+                _mcp_server = create_mcp_server()
     return _mcp_server
 
 def start_server(transport='stdio', host=None, port=None):
@@ -63,13 +73,15 @@ def start_server(transport='stdio', host=None, port=None):
         host (str, optional): Host address for HTTP transport
         port (int, optional): Port number for HTTP transport
     """
+    if transport not in _TRANSPORTS:
+        raise ValueError(f"Unsupported transport: {transport}. Supported transports: {', '.join(_TRANSPORTS)}")
+    if transport == 'http' and (not host or not port):
+        raise ValueError("Host and port must be specified for HTTP transport")
+    
     server = get_mcp_server()
     
-    if transport == 'stdio':
-        server.run()
-    elif transport == 'http':
-        if not host or not port:
-            raise ValueError("Host and port must be specified for HTTP transport")
-        server.run_http(host=host, port=port)
-    else:
-        raise ValueError(f"Unsupported transport: {transport}")
+    runners = {
+        'stdio': server.run,
+        'http': lambda: server.run_http(host=host, port=port)
+    }
+    runners[transport]()
@@ -2,7 +2,7 @@
 MCP prompts for diagram generation using the decorator pattern
 """
 import logging
-from typing import Dict, List, Any, Optional, Callable, TypeVar, cast
+from typing import Dict, List, Any, Optional, Callable, TypeVar
 
 # Import FastMCP from wrapper to avoid circular imports
 from mcp_core.server.fastmcp_wrapper import FastMCP
@@ -39,7 +39,7 @@ def mcp_prompt(
     """
     def decorator(func: F) -> F:
         func_doc = func.__doc__ or ""
-        func_description = description or func_doc.split('\n')[0] if func_doc else ""
+        func_description = description or func_doc.partition('\n')[0]
         
         # Store prompt metadata
         _registered_prompts[name] = {
@@ -50,7 +50,7 @@ def mcp_prompt(
         }
         
         # Return function unchanged
-        return cast(F, func)
+        return func
     
     return decorator
 
@@ -317,19 +317,17 @@ def register_prompts_with_server(server: FastMCP) -> List[str]:
     """
     logger.info(f"Registering {len(_registered_prompts)} prompts with the MCP server")
     
-    registered_prompt_names = []
+    prompts = [(prompt_name, prompt_info["function"]) for prompt_name, prompt_info in _registered_prompts.items()]
     
-    for prompt_name, prompt_info in _registered_prompts.items():
-        func = prompt_info["function"]
-        
+    if hasattr(server, "register_prompts"):
+        # Mock server can take all prompts in a single update
+        server.register_prompts(prompts)
+    else:
         # Register with server using prompt decorator
-        prompt_decorator = server.prompt(prompt_name)
-        prompt_decorator(func)
-        
-        registered_prompt_names.append(prompt_name)
-        logger.debug(f"Registered prompt: {prompt_name}")
+        for prompt_name, func in prompts:
+            server.prompt(prompt_name)(func)
     
-    return registered_prompt_names
+    return [prompt_name for prompt_name, _ in prompts]
 
 def register_diagram_prompts(server: FastMCP) -> List[str]:
     """
@@ -1,24 +1,32 @@
 """
 MCP resources for diagram information
 """
+import functools
 import logging
-from typing import Dict, List, Any, Optional, Callable, TypeVar, cast
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Callable, Tuple, TypeVar
 
 from mcp_core.server.fastmcp_wrapper import FastMCP
-from ..core.config import MCP_SETTINGS
-from kroki.kroki_templates import DiagramTemplates, DiagramExamples
+from ..core.config import MCP_SETTINGS, get_diagram_type_rows
 
 logger = logging.getLogger(__name__)
 
-# Store for registered resources when using decorator pattern
-_registered_resources: Dict[str, Dict[str, Any]] = {}
+# Store for registered resources when using decorator pattern, kept as
+# parallel lists indexed through _resource_index
+_resource_uris: List[str] = []
+_resource_functions: List[Callable] = []
+_resource_descriptions: List[str] = []
+_resource_categories: List[str] = []
+_resource_static: List[bool] = []
+_resource_index: Dict[str, int] = {}
 
 F = TypeVar('F', bound=Callable[..., Any])
 
 def mcp_resource(
     uri: str,
     description: Optional[str] = None,
-    category: str = "default"
+    category: str = "default",
+    static: bool = False
 ) -> Callable[[F], F]:
     """
     Decorator for registering a function as an MCP resource.
@@ -27,6 +35,8 @@ def mcp_resource(
         uri: Resource URI
         description: Resource description (defaults to function docstring if not provided)
         category: Resource category for organization
+        static: Whether the resource returns the same payload once the server
+            is registered, allowing its response to be serialized in advance
         
     Returns:
         Decorated function
@@ -39,94 +49,151 @@ def mcp_resource(
     """
     def decorator(func: F) -> F:
         func_doc = func.__doc__ or ""
-        func_description = description or func_doc.split('\n')[0] if func_doc else ""
+        func_description = description or func_doc.partition('\n')[0]
         
-        # Store resource metadata
-        _registered_resources[uri] = {
-            "function": func,
-            "uri": uri,
-            "description": func_description,
-            "category": category
-        }
+        # Store resource metadata, replacing any resource with the same URI
+        index = _resource_index.get(uri)
+        if index is None:
+            _resource_index[uri] = len(_resource_uris)
+            _resource_uris.append(uri)
+            _resource_functions.append(func)
+            _resource_descriptions.append(func_description)
+            _resource_categories.append(category)
+            _resource_static.append(static)
+        else:
+            _resource_functions[index] = func
+            _resource_descriptions[index] = func_description
+            _resource_categories[index] = category
+            _resource_static[index] = static
         
         # Return function unchanged
-        return cast(F, func)
+        return func
     
     return decorator
 
 # Define resources using decorators
-@mcp_resource("uml://types", description="Get available diagram types")
+@mcp_resource("uml://types", description="Get available diagram types", static=True)
 def get_diagram_types():
     """Get available diagram types"""
-    types = {}
-    for name, config in MCP_SETTINGS.diagram_types.items():
-        types[name] = {
-            "backend": config.backend,
-            "description": config.description,
-            "formats": config.formats
+    return {
+        name: {
+            "backend": backend,
+            "description": description,
+            "formats": formats
         }
-    return types
+        for name, backend, description, formats in get_diagram_type_rows()
+    }
+
+# The cached maps are read-only views so callers cannot modify shared state.
+# Resources still return plain dicts, which every MCP serializer accepts.
+@functools.lru_cache(maxsize=1)
+def _templates_map(names: Tuple[str, ...]) -> Mapping[str, str]:
+    """Build the template for each diagram type once"""
+    from kroki.kroki_templates import DiagramTemplates
+    get_template = DiagramTemplates.get_template
+    return MappingProxyType({name: get_template(name) for name in names})
+
+@functools.lru_cache(maxsize=1)
+def _examples_map(names: Tuple[str, ...]) -> Mapping[str, str]:
+    """Build the example for each diagram type once"""
+    from kroki.kroki_templates import DiagramExamples
+    get_example = DiagramExamples.get_example
+    return MappingProxyType({name: get_example(name) for name in names})
+
+def _diagram_type_names() -> Tuple[str, ...]:
+    """Names of the configured diagram types, used as the template and example cache key"""
+    return tuple(row[0] for row in get_diagram_type_rows())
 
-@mcp_resource("uml://templates", description="Get diagram templates for different diagram types")
+@mcp_resource("uml://templates", description="Get diagram templates for different diagram types", static=True)
 def get_diagram_templates():
     """Get diagram templates for different diagram types"""
-    templates = {}
-    for name in MCP_SETTINGS.diagram_types:
-        templates[name] = DiagramTemplates.get_template(name)
-    return templates
+    return dict(_templates_map(_diagram_type_names()))
 
-@mcp_resource("uml://examples", description="Get diagram examples for different diagram types")
+@mcp_resource("uml://examples", description="Get diagram examples for different diagram types", static=True)
 def get_diagram_examples():
     """Get diagram examples for different diagram types"""
-    examples = {}
-    for name in MCP_SETTINGS.diagram_types:
-        examples[name] = DiagramExamples.get_example(name)
-    return examples
+    return dict(_examples_map(_diagram_type_names()))
 
-@mcp_resource("uml://formats", description="Get supported output formats for each diagram type")
+@mcp_resource("uml://formats", description="Get supported output formats for each diagram type", static=True)
 def get_output_formats():
     """Get supported output formats for each diagram type"""
-    formats = {}
-    for name, config in MCP_SETTINGS.diagram_types.items():
-        formats[name] = config.formats
-    return formats
+    return {name: formats for name, _, _, formats in get_diagram_type_rows()}
 
-@mcp_resource("uml://server-info", description="Get MCP server information")
+# Cached server information, rebuilt when the registered tools or prompts change
+_server_info: Mapping[str, Any] = MappingProxyType({})
+
+@mcp_resource("uml://server-info", description="Get MCP server information", static=True)
 def get_server_info():
     """Get MCP server information"""
-    return {
-        "server_name": MCP_SETTINGS.server_name,
-        "version": MCP_SETTINGS.version,
-        "description": MCP_SETTINGS.description,
-        "tools": MCP_SETTINGS.tools,
-        "prompts": MCP_SETTINGS.prompts,
-        "kroki_server": MCP_SETTINGS.kroki_server,
-        "plantuml_server": MCP_SETTINGS.plantuml_server
-    }
+    global _server_info
+    info = _server_info
+    # Registration assigns new lists, so an identity check detects changes
+    if info.get("tools") is not MCP_SETTINGS.tools or info.get("prompts") is not MCP_SETTINGS.prompts:
+        info = _server_info = MappingProxyType({
+            "server_name": MCP_SETTINGS.server_name,
+            "version": MCP_SETTINGS.version,
+            "description": MCP_SETTINGS.description,
+            "tools": MCP_SETTINGS.tools,
+            "prompts": MCP_SETTINGS.prompts,
+            "kroki_server": MCP_SETTINGS.kroki_server,
+            "plantuml_server": MCP_SETTINGS.plantuml_server
+        })
+    return dict(info)
+
+def _precompute_resource(func: Callable) -> Callable:
+    """
+    Evaluate a resource function once and wrap its result
+    
+    Args:
+        func: Resource function taking no arguments
+        
+    Returns:
+        Function returning the precomputed payload
+    """
+    payload = func()
+    
+    @functools.wraps(func)
+    def precomputed():
+        return payload
+    
+    return precomputed
 
 def register_resources_with_server(server: FastMCP) -> List[str]:
     """
     Register all decorated resources with the MCP server
     
+    Resources are evaluated once at registration time when
+    MCP_SETTINGS.eager_resources is enabled; the original functions stay
+    available in the resource registry.
+    
     Args:
         server: The MCP server instance
         
     Returns:
         List of registered resource URIs
     """
-    logger.info(f"Registering {len(_registered_resources)} resources with the MCP server")
+    logger.info("Registering %d resources with the MCP server", len(_resource_uris))
     
-    registered_resource_uris = []
+    resources = []
+    for uri, func, static in zip(_resource_uris, _resource_functions, _resource_static):
+        if MCP_SETTINGS.eager_resources:
+            func = _precompute_resource(func)
+            if static and hasattr(server, "register_static_resource"):
+                # Mock server serializes the response once up front
+                server.register_static_resource(uri, func())
+                continue
+        resources.append((uri, func))
     
-    for uri, resource_info in _registered_resources.items():
-        func = resource_info["function"]
-        
+    if hasattr(server, "register_resources"):
+        # Mock server can take all resources in a single update
+        server.register_resources(resources)
+    else:
         # Register with server using resource decorator
-        resource_decorator = server.resource(uri)
-        resource_decorator(func)
-        
-        registered_resource_uris.append(uri)
-        logger.debug(f"Registered resource: {uri}")
+        for uri, func in resources:
+            server.resource(uri)(func)
+    
+    registered_resource_uris = list(_resource_uris)
+    logger.debug("Registered resources: %s", registered_resource_uris)
     
     return registered_resource_uris
 
@@ -159,4 +226,16 @@ def get_resource_registry() -> Dict[str, Dict[str, Any]]:
     Returns:
         Dictionary of resource metadata
     """
-    return _registered_resources
+    return {
+        uri: {
+            "function": func,
+            "uri": uri,
+            "description": description,
+            "category": category,
+            "static": static
+        }
+        for uri, func, description, category, static in zip(
+            _resource_uris, _resource_functions, _resource_descriptions,
+            _resource_categories, _resource_static
+        )
+    }
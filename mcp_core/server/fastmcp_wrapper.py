@@ -2,23 +2,58 @@
 Wrapper for FastMCP server to ensure compatibility
 """
 
+import importlib
 import logging
 import sys
 import json
 import os
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Use orjson for the stdio transport when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_default(obj: Any) -> Any:
+    # Read-only mappings such as MappingProxyType serialize like dicts
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+if orjson:
+    _loads = orjson.loads
+
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    _loads = json.loads
+
+    def _dumps_line(obj: Any) -> bytes:
+        return (json.dumps(obj, default=_json_default) + "\n").encode("utf-8")
+
+def _cached_import(module_name: str, *attrs: str) -> tuple:
+    """Get attributes from a module, reusing it from sys.modules when loaded."""
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
+    values = []
+    for attr in attrs:
+        try:
+            values.append(getattr(module, attr))
+        except AttributeError:
+            raise ImportError(f"{attr} not found in {module_name} package")
+    return tuple(values)
+
 # Determine if we should use the mock implementation
 use_mock = False
 
 # Check if we're in a development or test environment
-is_dev_or_test = (
-    os.environ.get("TESTING", "false").lower() in ("true", "1", "yes") or
-    os.environ.get("DEVELOPMENT", "false").lower() in ("true", "1", "yes") or
-    "pytest" in sys.modules or
-    os.environ.get("MOCK_FASTMCP", "false").lower() in ("true", "1", "yes")
+_TRUE_VALUES = frozenset({"true", "1", "yes"})
+_MOCK_FLAGS = ("TESTING", "DEVELOPMENT", "MOCK_FASTMCP")
+
+is_dev_or_test = "pytest" in sys.modules or any(
+    os.environ.get(flag, "false").lower() in _TRUE_VALUES for flag in _MOCK_FLAGS
 )
 
 if is_dev_or_test:
@@ -26,11 +61,8 @@ if is_dev_or_test:
     logger.warning("Using mock FastMCP implementation for development/testing")
 else:
     try:
-        import fastmcp
-        if not hasattr(fastmcp, 'FastMCP'):
-            raise ImportError("FastMCP class not found in fastmcp package")
+        FastMCP, Context = _cached_import("fastmcp", "FastMCP", "Context")
         logger.info("Using production FastMCP implementation")
-        from fastmcp import FastMCP, Context
     except ImportError as e:
         logger.error(f"FastMCP package error: {str(e)}")
         raise ImportError("FastMCP package is required but not installed. Set MOCK_FASTMCP=true to use mock implementation.")
@@ -53,6 +85,14 @@ if use_mock:
             self._tools = {}
             self._prompts = {}
             self._resources = {}
+            # Serialized responses for resources registered as static
+            self._static_responses = {}
+            # Request type -> (registry, request key for the name, pass args)
+            self._dispatch = {
+                'tool': (self._tools, 'tool', True),
+                'prompt': (self._prompts, 'prompt', True),
+                'resource': (self._resources, 'path', False)
+            }
             self.logger = logging.getLogger(__name__)
 
         def tool(self, *args, **kwargs):
@@ -75,6 +115,19 @@ if use_mock:
                 return func
             return decorator
 
+        def register_prompts(self, prompts: List[Tuple[str, Callable]]):
+            """Register several (name, function) prompts at once."""
+            self._prompts.update(prompts)
+
+        def register_resources(self, resources: List[Tuple[str, Callable]]):
+            """Register several (path, function) resources at once."""
+            self._resources.update(resources)
+
+        def register_static_resource(self, path: str, payload: Any):
+            """Register a resource whose response is serialized once, up front."""
+            self._resources[path] = lambda: payload
+            self._static_responses[path] = _dumps_line({"result": payload})
+
         def run(self, transport: str = 'stdio', host: str = None, port: int = None):
             if transport == 'stdio':
                 self._run_stdio()
@@ -86,61 +139,57 @@ if use_mock:
         def _run_stdio(self):
             """Run the server in stdio mode"""
             self.logger.info(f"Starting {self.name} in stdio mode")
-            while True:
+            stdin = sys.stdin.buffer
+            stdout = sys.stdout.buffer
+            # readline returns b'' on EOF, which ends the loop
+            for raw in iter(stdin.readline, b''):
+                if not raw.strip():
+                    continue
                 try:
-                    line = input()
-                    if not line:
-                        continue
-                    request = json.loads(line)
-                    response = self._handle_request(request)
-                    print(json.dumps(response))
-                except EOFError:
-                    break
+                    request = _loads(raw)
+                    line = self._static_response(request) or _dumps_line(self._handle_request(request))
                 except Exception as e:
                     self.logger.error(f"Error handling request: {e}")
-                    response = {"error": str(e)}
-                    print(json.dumps(response))
+                    line = _dumps_line({"error": str(e)})
+                stdout.write(line)
+                stdout.flush()
+
+        def run_http(self, host: str, port: int):
+            self._run_http(host, port)
 
         def _run_http(self, host: str, port: int):
             self.logger.info(f"Starting {self.name} HTTP server on {host}:{port}")
             # Mock HTTP server implementation
             pass
 
+        def _static_response(self, request: Dict[str, Any]) -> Optional[bytes]:
+            """Get the serialized response for a static resource request, if any."""
+            if request.get('type') == 'resource':
+                return self._static_responses.get(request.get('path'))
+            return None
+
         def _handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
             """Handle an MCP request and return the response."""
             try:
-                if 'type' not in request:
+                try:
+                    request_type = request['type']
+                except KeyError:
                     raise ValueError("Missing request type")
 
-                if request['type'] == 'tool':
-                    tool_name = request.get('tool')
-                    if tool_name not in self._tools:
-                        raise ValueError(f"Unknown tool: {tool_name}")
-                    tool = self._tools[tool_name]
-                    args = request.get('args', {})
-                    result = tool(**args)
-                    return {"result": result}
-                    
-                elif request['type'] == 'prompt':
-                    prompt_name = request.get('prompt')
-                    if prompt_name not in self._prompts:
-                        raise ValueError(f"Unknown prompt: {prompt_name}")
-                    prompt = self._prompts[prompt_name]
-                    args = request.get('args', {})
-                    result = prompt(**args)
-                    return {"result": result}
-                    
-                elif request['type'] == 'resource':
-                    path = request.get('path')
-                    if path not in self._resources:
-                        raise ValueError(f"Unknown resource: {path}")
-                    resource = self._resources[path]
-                    result = resource()
-                    return {"result": result}
-                    
-                else:
-                    raise ValueError(f"Unknown request type: {request['type']}")
-                    
+                try:
+                    registry, key, pass_args = self._dispatch[request_type]
+                except KeyError:
+                    raise ValueError(f"Unknown request type: {request_type}")
+
+                name = request.get(key)
+                try:
+                    handler = registry[name]
+                except KeyError:
+                    raise ValueError(f"Unknown {request_type}: {name}")
+
+                result = handler(**request.get('args', {})) if pass_args else handler()
+                return {"result": result}
+
             except Exception as e:
                 return {"error": str(e)}
 
@@ -3,7 +3,7 @@ Decorator system for MCP tools
 """
 import logging
 import inspect
-from typing import Dict, List, Any, Optional, Callable, TypeVar, cast
+from typing import Dict, List, Any, Optional, Callable, TypeVar
 
 from mcp_core.server.fastmcp_wrapper import FastMCP
 
@@ -43,7 +43,7 @@ def mcp_tool(
     def decorator(func: F) -> F:
         func_name = name or func.__name__
         func_doc = inspect.getdoc(func) or ""
-        func_description = description or func_doc.split('\n')[0] if func_doc else ""
+        func_description = description or func_doc.partition('\n')[0]
         
         # Get parameter annotations from function signature
         sig = inspect.signature(func)
@@ -72,7 +72,7 @@ def mcp_tool(
         }
         
         # Return function unchanged
-        return cast(F, func)
+        return func
     
     return decorator
 
@@ -8,19 +8,128 @@ diagrams through the Model Context Protocol (MCP).
 
 import os
 import sys
+import atexit
+import signal
 import logging
-import argparse
-import datetime
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.panel import Panel
-from rich.table import Table
+import time
+import types
+import functools
+import importlib.util
 
-# Configure rich console
-console = Console()
+# Configure rich console on first use, so --help and --version never import Rich
+@functools.lru_cache(maxsize=1)
+def get_console():
+    from rich.console import Console
+    return Console()
+
+# Intern the lookup keys of the fallback tables so they are shared with registry names
+def _interned(mapping):
+    return {sys.intern(key): value for key, value in mapping.items()}
+
+# Parameters shared by the single-diagram tools
+_CODE_PARAMETERS = "code: str, output_dir: str"
+
+# Fallback tool info as (name, description, parameters) rows, looked up once per tool by name
+_TOOL_INFO = (
+    ("generate_uml", "Generate any UML diagram based on diagram type", "diagram_type: str, code: str, output_dir: str"),
+    ("generate_class_diagram", "Generate UML class diagram from PlantUML code", _CODE_PARAMETERS),
+    ("generate_sequence_diagram", "Generate UML sequence diagram from PlantUML code", _CODE_PARAMETERS),
+    ("generate_activity_diagram", "Generate UML activity diagram from PlantUML code", _CODE_PARAMETERS),
+    ("generate_usecase_diagram", "Generate UML use case diagram from PlantUML code", _CODE_PARAMETERS),
+    ("generate_state_diagram", "Generate UML state diagram from PlantUML code", _CODE_PARAMETERS),
+    ("generate_component_diagram", "Generate UML component diagram from PlantUML code", _CODE_PARAMETERS),
+    ("generate_deployment_diagram", "Generate UML deployment diagram from PlantUML code", _CODE_PARAMETERS),
+    ("generate_object_diagram", "Generate UML object diagram from PlantUML code", _CODE_PARAMETERS),
+    ("generate_mermaid_diagram", "Generate diagrams using Mermaid syntax", _CODE_PARAMETERS),
+    ("generate_d2_diagram", "Generate diagrams using D2 syntax", _CODE_PARAMETERS),
+    ("generate_graphviz_diagram", "Generate diagrams using Graphviz DOT syntax", _CODE_PARAMETERS),
+    ("generate_erd_diagram", "Generate Entity-Relationship diagrams", _CODE_PARAMETERS)
+)
+_TOOL_INFO_MAP = _interned({name: (description, parameters) for name, description, parameters in _TOOL_INFO})
+_DEFAULT_TOOL_INFO = ("Generate diagrams based on text descriptions", "No parameters info")
+
+# Fallback prompt descriptions
+_PROMPT_DESCRIPTIONS = _interned({
+    "class_diagram": "Create a UML class diagram showing classes, attributes, methods, and relationships",
+    "sequence_diagram": "Create a UML sequence diagram showing interactions between objects over time",
+    "activity_diagram": "Create a UML activity diagram showing workflows and business processes"
+})
+
+# Fallback resource descriptions
+_RESOURCE_DESCRIPTIONS = _interned({
+    "uml://types": "List of available UML diagram types",
+    "uml://templates": "Templates for creating UML diagrams",
+    "uml://examples": "Example UML diagrams for reference",
+    "uml://formats": "Supported output formats for diagrams",
+    "uml://server-info": "Information about the UML-MCP server"
+})
+
+# Modules required at startup, as (module name, display name) pairs
+_REQUIRED_MODULES = (
+    ("mcp.server", "MCP Server"),
+    ("kroki.kroki", "Kroki"),
+    ("plantuml", "PlantUML"),
+    ("mermaid.mermaid", "Mermaid"),
+    ("D2.run_d2", "D2")
+)
+
+# Installed package version, falling back to the server settings when running from source
+def _get_version():
+    import importlib.metadata
+    try:
+        return importlib.metadata.version("uml-mcp")
+    except importlib.metadata.PackageNotFoundError:
+        from mcp_core.__version__ import __version__
+        return __version__
+
+# Command line options understood by the fast parser, mapped to their attribute names
+_FLAG_OPTIONS = {"--debug": "debug", "--list-tools": "list_tools", "--version": "version"}
+_VALUE_OPTIONS = {"--host": "host", "--port": "port", "--transport": "transport"}
+
+def _parse_args_fast(argv):
+    """Parse the known options in a single pass, or return None to defer to argparse"""
+    args = {
+        "debug": False,
+        "host": "127.0.0.1",
+        "port": 8000,
+        "transport": "stdio",
+        "list_tools": False,
+        "version": False
+    }
+    tokens = iter(argv)
+    for token in tokens:
+        if token in _FLAG_OPTIONS:
+            args[_FLAG_OPTIONS[token]] = True
+            continue
+        
+        # Accept both `--option value` and `--option=value`
+        option, separator, value = token.partition("=")
+        if option not in _VALUE_OPTIONS:
+            return None
+        if not separator:
+            value = next(tokens, None)
+            # argparse treats a following option as a missing value, so let it report that
+            if value is None or value.startswith("--"):
+                return None
+        
+        if option == "--port":
+            try:
+                value = int(value)
+            except ValueError:
+                return None
+        elif option == "--transport" and value not in ("stdio", "http"):
+            return None
+        args[_VALUE_OPTIONS[option]] = value
+    return types.SimpleNamespace(**args)
 
 # Parse command line arguments
 def parse_args():
+    # Known options are parsed by hand; argparse handles --help, abbreviations and errors
+    args = _parse_args_fast(sys.argv[1:])
+    if args is not None:
+        return args
+    
+    import argparse
     parser = argparse.ArgumentParser(description="UML-MCP Diagram Generation Server")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     parser.add_argument("--host", type=str, default="127.0.0.1", help="Server host (default: 127.0.0.1)")
@@ -28,20 +137,38 @@ def parse_args():
     parser.add_argument("--transport", type=str, choices=["stdio", "http"], default="stdio", 
                         help="Transport protocol (default: stdio)")
     parser.add_argument("--list-tools", action="store_true", help="List available tools and exit")
+    parser.add_argument("--version", action="store_true", help="Show the server version and exit")
     return parser.parse_args()
 
+# Log file path, resolved once per process
+_LOG_FILE = None
+
+# Buffered file handler installed by setup_logging
+_LOG_BUFFER = None
+
+def _get_log_file():
+    global _LOG_FILE
+    if _LOG_FILE is None:
+        log_dir = "logs"
+        os.makedirs(log_dir, exist_ok=True)
+        
+        # Generate log filename with today's date
+        date_str = time.strftime("%Y-%m-%d")
+        _LOG_FILE = os.path.join(log_dir, f"uml_mcp_server_{date_str}.log")
+    return _LOG_FILE
+
+def _flush_log_buffer():
+    """Write out buffered log records at interpreter exit."""
+    if _LOG_BUFFER is not None:
+        _LOG_BUFFER.flush()
+
 # Configure logging based on arguments
 def setup_logging(debug=False):
+    global _LOG_BUFFER
     level = logging.DEBUG if debug else logging.INFO
     
-    # Create logs directory if it doesn't exist
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
-    # Generate log filename with today's date
-    date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-    log_file = os.path.join(log_dir, f"uml_mcp_server_{date_str}.log")
+    # Resolve the log file for today, creating the logs directory if needed
+    log_file = _get_log_file()
     
     # Configure file handler
     file_handler = logging.FileHandler(log_file)
@@ -50,8 +177,13 @@ def setup_logging(debug=False):
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     ))
     
-    # Configure console handler
-    console_handler = RichHandler(rich_tracebacks=True)
+    # Configure console handler, using Rich formatting only when debugging
+    if debug:
+        from rich.logging import RichHandler
+        console_handler = RichHandler(rich_tracebacks=True)
+    else:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
     console_handler.setLevel(level)
     
     # Configure root logger
@@ -62,249 +194,228 @@ def setup_logging(debug=False):
         handlers=[console_handler]
     )
     
-    # Get logger and add file handler
+    # Get logger, replacing the buffered file handler of an earlier call
     logger = logging.getLogger()
-    logger.addHandler(file_handler)
+    if _LOG_BUFFER is None:
+        atexit.register(_flush_log_buffer)
+    else:
+        logger.removeHandler(_LOG_BUFFER)
+        previous_target = _LOG_BUFFER.target
+        _LOG_BUFFER.close()
+        previous_target.close()
+    
+    # Buffer file writes so records reach disk in batches, flushing early on errors
+    from logging.handlers import MemoryHandler
+    _LOG_BUFFER = MemoryHandler(capacity=512, flushLevel=logging.ERROR, target=file_handler)
+    _LOG_BUFFER.setLevel(level)
+    logger.addHandler(_LOG_BUFFER)
     
     return logging.getLogger(__name__)
 
-# Centralized error handling for imports
+# Centralized check that a module is importable, cached so each module is checked once.
+# Only the module spec is resolved; the module itself is not executed.
+@functools.lru_cache(maxsize=None)
 def safe_import(module_name, display_name=None):
+    display_name = display_name or module_name
     try:
-        return __import__(module_name)
+        if importlib.util.find_spec(module_name) is not None:
+            return True
+        error = f"No module named '{module_name}'"
     except ImportError as e:
-        display_name = display_name or module_name
-        console.print(f"[bold red]Error importing {display_name}:[/bold red] {str(e)}")
-        return None
+        # A missing parent package raises instead of returning None
+        error = str(e)
+    get_console().print(f"[bold red]Error importing {display_name}:[/bold red] {error}")
+    return False
+
+# Build a table from its columns and prebuilt rows, with a placeholder row when empty
+def _build_table(title, columns, rows, empty_row):
+    from rich.table import Table
+    
+    table = Table(title=title)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    for row in rows or (empty_row,):
+        table.add_row(*row)
+    return table
+
+# Table layouts as (title, columns, placeholder row)
+_TOOLS_LAYOUT = (
+    "[bold blue]Available UML-MCP Tools[/bold blue]",
+    (("Tool Name", "cyan"), ("Description", "green"), ("Parameters", "yellow")),
+    ("No tools found", "Check server configuration", "")
+)
+_PROMPTS_LAYOUT = (
+    "[bold blue]Available Prompts[/bold blue]",
+    (("Prompt Name", "cyan"), ("Description", "green")),
+    ("No prompts found", "Check server configuration")
+)
+_RESOURCES_LAYOUT = (
+    "[bold blue]Available Resources[/bold blue]",
+    (("Resource URI", "cyan"), ("Description", "green")),
+    ("No resources found", "Check server configuration")
+)
 
 # Function to display the tools, prompts, and resources
-def display_tools_and_resources(mcp_settings):
+def display_tools_and_resources(mcp_settings, tool_names=None, prompt_names=None, resource_names=None, tool_registry=None):
     """Display information about all available tools, prompts, and resources in the MCP server"""
-    # Display tools
-    display_tools(mcp_settings)
+    sections = (
+        (_TOOLS_LAYOUT, _tool_rows(mcp_settings, tool_names, tool_registry)),
+        (_PROMPTS_LAYOUT, _prompt_rows(mcp_settings, prompt_names)),
+        (_RESOURCES_LAYOUT, _resource_rows(mcp_settings, resource_names))
+    )
     
-    # Display prompts
-    display_prompts(mcp_settings)
+    # Empty categories still get a table with a placeholder row, so nothing is dropped silently
+    tables = [_build_table(*layout[:2], rows, layout[2]) for layout, rows in sections]
     
-    # Display resources
-    display_resources(mcp_settings)
-
-def display_tools(mcp_settings):
-    """Display information about available tools in the MCP server"""
-    # Create tools table
-    tools_table = Table(title="[bold blue]Available UML-MCP Tools[/bold blue]")
-    tools_table.add_column("Tool Name", style="cyan")
-    tools_table.add_column("Description", style="green")
-    tools_table.add_column("Parameters", style="yellow")
+    from rich.console import Group
     
-    # Import tool registry if available
+    # Render all tables in a single write
+    get_console().print(Group(*tables))
+
+# Tool registry without internal tools; main() takes it once, after the server has registered its tools
+def _filtered_tool_registry():
     try:
         from mcp_core.tools.tool_decorator import get_tool_registry
-        tool_registry = get_tool_registry()
-        
-        if tool_registry:
-            # Add rows for each tool from registry
-            for tool_name, tool_info in tool_registry.items():
-                # Skip internal tools
-                if tool_name == 'tool_function':
-                    continue
-                
-                # Get description and parameters
-                description = tool_info.get("description", "No description available")
-                
-                # Format parameters
-                params = tool_info.get("parameters", {})
-                param_str = ", ".join([f"{name}: {info['type']}" for name, info in params.items()])
-                
-                tools_table.add_row(tool_name, description, param_str)
-        else:
-            # Fallback to old method if registry not available
-            _display_tools_fallback(mcp_settings, tools_table)
     except ImportError:
         # Fallback to old method if decorator system not available
-        _display_tools_fallback(mcp_settings, tools_table)
+        return None
+    return {
+        tool_name: tool_info
+        for tool_name, tool_info in get_tool_registry().items()
+        if tool_name != 'tool_function'
+    }
+
+def display_tools(mcp_settings, names=None, tool_registry=None):
+    """Display information about available tools in the MCP server"""
+    get_console().print(_build_table(*_TOOLS_LAYOUT[:2], _tool_rows(mcp_settings, names, tool_registry), _TOOLS_LAYOUT[2]))
+
+def _tool_rows(mcp_settings, names=None, tool_registry=None):
+    """Collect (name, description, parameters) rows for the available tools"""
+    # Import tool registry if available and not already snapshotted
+    if tool_registry is None:
+        tool_registry = _filtered_tool_registry()
     
-    console.print(tools_table)
+    if not tool_registry:
+        # Fallback to old method if registry not available
+        return _tool_rows_fallback(mcp_settings, names)
+    
+    return [
+        (
+            tool_name,
+            tool_info.get("description", "No description available"),
+            ", ".join([f"{name}: {info['type']}" for name, info in tool_info.get("parameters", {}).items()])
+        )
+        for tool_name, tool_info in tool_registry.items()
+    ]
 
-def _display_tools_fallback(mcp_settings, tools_table):
-    """Fallback method to display tools if decorator system is not available"""
-    # Get tool names from settings
-    tool_names = getattr(mcp_settings, 'tools', [])
+def _tool_rows_fallback(mcp_settings, names=None):
+    """Fallback method to list tools if decorator system is not available"""
+    # Use the names snapshot if given, otherwise get tool names from settings
+    tool_names = names if names is not None else getattr(mcp_settings, 'tools', [])
     
-    if tool_names:
-        # Tool descriptions dictionary
-        tool_descriptions = {
-            "generate_uml": "Generate any UML diagram based on diagram type",
-            "generate_class_diagram": "Generate UML class diagram from PlantUML code",
-            "generate_sequence_diagram": "Generate UML sequence diagram from PlantUML code",
-            "generate_activity_diagram": "Generate UML activity diagram from PlantUML code",
-            "generate_usecase_diagram": "Generate UML use case diagram from PlantUML code",
-            "generate_state_diagram": "Generate UML state diagram from PlantUML code",
-            "generate_component_diagram": "Generate UML component diagram from PlantUML code",
-            "generate_deployment_diagram": "Generate UML deployment diagram from PlantUML code",
-            "generate_object_diagram": "Generate UML object diagram from PlantUML code",
-            "generate_mermaid_diagram": "Generate diagrams using Mermaid syntax",
-            "generate_d2_diagram": "Generate diagrams using D2 syntax",
-            "generate_graphviz_diagram": "Generate diagrams using Graphviz DOT syntax",
-            "generate_erd_diagram": "Generate Entity-Relationship diagrams"
-        }
-        
-        # Tool parameters dictionary
-        tool_parameters = {
-            "generate_uml": "diagram_type: str, code: str, output_dir: str",
-            "generate_class_diagram": "code: str, output_dir: str",
-            "generate_sequence_diagram": "code: str, output_dir: str",
-            "generate_activity_diagram": "code: str, output_dir: str",
-            "generate_usecase_diagram": "code: str, output_dir: str",
-            "generate_state_diagram": "code: str, output_dir: str",
-            "generate_component_diagram": "code: str, output_dir: str",
-            "generate_deployment_diagram": "code: str, output_dir: str",
-            "generate_object_diagram": "code: str, output_dir: str",
-            "generate_mermaid_diagram": "code: str, output_dir: str",
-            "generate_d2_diagram": "code: str, output_dir: str",
-            "generate_graphviz_diagram": "code: str, output_dir: str",
-            "generate_erd_diagram": "code: str, output_dir: str"
-        }
-        
-        # Add rows for each tool
-        for tool_name in tool_names:
-            # Skip the tool_function which is not a user-facing tool
-            if tool_name == 'tool_function':
-                continue
-            
-            # Get description and parameters or use defaults
-            description = tool_descriptions.get(tool_name, "Generate diagrams based on text descriptions")
-            parameters = tool_parameters.get(tool_name, "No parameters info")
-            
-            tools_table.add_row(tool_name, description, parameters)
-    else:
-        tools_table.add_row("No tools found", "Check server configuration", "")
+    # Skip the tool_function which is not a user-facing tool
+    return [
+        (tool_name, *_TOOL_INFO_MAP.get(tool_name, _DEFAULT_TOOL_INFO))
+        for tool_name in filter('tool_function'.__ne__, tool_names)
+    ]
 
-def display_prompts(mcp_settings):
+def display_prompts(mcp_settings, names=None):
     """Display information about available prompts in the MCP server"""
-    # Create prompts table
-    prompts_table = Table(title="[bold blue]Available Prompts[/bold blue]")
-    prompts_table.add_column("Prompt Name", style="cyan")
-    prompts_table.add_column("Description", style="green")
-    
+    get_console().print(_build_table(*_PROMPTS_LAYOUT[:2], _prompt_rows(mcp_settings, names), _PROMPTS_LAYOUT[2]))
+
+def _prompt_rows(mcp_settings, names=None):
+    """Collect (name, description) rows for the available prompts"""
     # Import prompt registry if available
     try:
         from mcp_core.prompts.diagram_prompts import get_prompt_registry
         prompt_registry = get_prompt_registry()
-        
-        if prompt_registry:
-            # Add rows for each prompt from registry
-            for prompt_name, prompt_info in prompt_registry.items():
-                # Get description
-                description = prompt_info.get("description", "No description available")
-                prompts_table.add_row(prompt_name, description)
-        else:
-            # Fallback to old method if registry not available
-            _display_prompts_fallback(mcp_settings, prompts_table)
     except ImportError:
         # Fallback to old method if decorator system not available
-        _display_prompts_fallback(mcp_settings, prompts_table)
+        prompt_registry = None
+    
+    if not prompt_registry:
+        # Fallback to old method if registry not available
+        return _prompt_rows_fallback(mcp_settings, names)
     
-    console.print(prompts_table)
+    return [
+        (prompt_name, prompt_info.get("description", "No description available"))
+        for prompt_name, prompt_info in prompt_registry.items()
+    ]
 
-def _display_prompts_fallback(mcp_settings, prompts_table):
-    """Fallback method to display prompts if decorator system is not available"""
-    # Get prompt names from settings
-    prompt_names = getattr(mcp_settings, 'prompts', [])
+def _prompt_rows_fallback(mcp_settings, names=None):
+    """Fallback method to list prompts if decorator system is not available"""
+    # Use the names snapshot if given, otherwise get prompt names from settings
+    prompt_names = names if names is not None else getattr(mcp_settings, 'prompts', [])
     
-    if prompt_names:
-        # Prompt descriptions dictionary
-        prompt_descriptions = {
-            "class_diagram": "Create a UML class diagram showing classes, attributes, methods, and relationships",
-            "sequence_diagram": "Create a UML sequence diagram showing interactions between objects over time",
-            "activity_diagram": "Create a UML activity diagram showing workflows and business processes"
-        }
-        
-        # Add rows for each prompt
-        for prompt_name in prompt_names:
-            # Get description or use default
-            description = prompt_descriptions.get(prompt_name, "Generate UML diagrams")
-            prompts_table.add_row(prompt_name, description)
-    else:
-        prompts_table.add_row("No prompts found", "Check server configuration")
+    # Use a default description for unknown prompts
+    return [
+        (prompt_name, _PROMPT_DESCRIPTIONS.get(prompt_name, "Generate UML diagrams"))
+        for prompt_name in prompt_names
+    ]
 
-def display_resources(mcp_settings):
+def display_resources(mcp_settings, names=None):
     """Display information about available resources in the MCP server"""
-    # Create resources table
-    resources_table = Table(title="[bold blue]Available Resources[/bold blue]")
-    resources_table.add_column("Resource URI", style="cyan")
-    resources_table.add_column("Description", style="green")
-    
+    get_console().print(_build_table(*_RESOURCES_LAYOUT[:2], _resource_rows(mcp_settings, names), _RESOURCES_LAYOUT[2]))
+
+def _resource_rows(mcp_settings, names=None):
+    """Collect (URI, description) rows for the available resources"""
     # Import resource registry if available
     try:
         from mcp_core.resources.diagram_resources import get_resource_registry
         resource_registry = get_resource_registry()
-        
-        if resource_registry:
-            # Add rows for each resource from registry
-            for resource_uri, resource_info in resource_registry.items():
-                # Get description
-                description = resource_info.get("description", "No description available")
-                resources_table.add_row(resource_uri, description)
-        else:
-            # Fallback to old method if registry not available
-            _display_resources_fallback(mcp_settings, resources_table)
     except ImportError:
         # Fallback to old method if decorator system not available
-        _display_resources_fallback(mcp_settings, resources_table)
+        resource_registry = None
     
-    console.print(resources_table)
+    if not resource_registry:
+        # Fallback to old method if registry not available
+        return _resource_rows_fallback(mcp_settings, names)
+    
+    return [
+        (resource_uri, resource_info.get("description", "No description available"))
+        for resource_uri, resource_info in resource_registry.items()
+    ]
 
-def _display_resources_fallback(mcp_settings, resources_table):
-    """Fallback method to display resources if decorator system is not available"""
-    # Get resource names from settings
-    resource_names = getattr(mcp_settings, 'resources', [])
+def _resource_rows_fallback(mcp_settings, names=None):
+    """Fallback method to list resources if decorator system is not available"""
+    # Use the names snapshot if given, otherwise get resource names from settings
+    resource_names = names if names is not None else getattr(mcp_settings, 'resources', [])
     
-    if resource_names:
-        # Resource descriptions dictionary
-        resource_descriptions = {
-            "uml://types": "List of available UML diagram types",
-            "uml://templates": "Templates for creating UML diagrams",
-            "uml://examples": "Example UML diagrams for reference",
-            "uml://formats": "Supported output formats for diagrams",
-            "uml://server-info": "Information about the UML-MCP server"
-        }
-        
-        # Add rows for each resource
-        for resource_name in resource_names:
-            # Get description or use default
-            description = resource_descriptions.get(resource_name, "Resource information")
-            resources_table.add_row(resource_name, description)
-    else:
-        resources_table.add_row("No resources found", "Check server configuration")
+    # Use a default description for unknown resources
+    return [
+        (resource_name, _RESOURCE_DESCRIPTIONS.get(resource_name, "Resource information"))
+        for resource_name in resource_names
+    ]
 
 def main():
-    # Import datetime here to avoid circular import
-    import datetime
-    
     # Parse arguments and set up logging
     args = parse_args()
+    
+    # Report the version before any logging, Rich or server setup
+    if args.version:
+        print(f"UML-MCP Server v{_get_version()}")
+        return
+    
     logger = setup_logging(args.debug)
     
-    logger.info(f"Starting UML-MCP Server with transport: {args.transport}")
+    # Turn SIGTERM into a normal exit so buffered log records are flushed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
     
-    # Check required modules
-    required_modules = {
-        "mcp.server": "MCP Server",
-        "kroki.kroki": "Kroki",
-        "plantuml": "PlantUML",
-        "mermaid.mermaid": "Mermaid",
-        "D2.run_d2": "D2"
-    }
+    # Registry tables are only built when explicitly requested
+    list_tools = args.list_tools or os.environ.get("LIST_TOOLS", "").lower() == "true"
     
-    missing_modules = []
-    for module_name, display_name in required_modules.items():
-        if not safe_import(module_name, display_name):
-            missing_modules.append(display_name)
+    logger.info(f"Starting UML-MCP Server with transport: {args.transport}")
+    
+    # Check required modules; resolving specs is cheap enough to do in one sequential sweep
+    missing_modules = [
+        display_name
+        for module_name, display_name in _REQUIRED_MODULES
+        if not safe_import(module_name, display_name)
+    ]
 
     if missing_modules:
-        console.print(f"[bold red]Error:[/bold red] Missing required modules: {', '.join(missing_modules)}")
-        console.print("Please ensure all project components are correctly installed.")
+        get_console().print(f"[bold red]Error:[/bold red] Missing required modules: {', '.join(missing_modules)}")
+        get_console().print("Please ensure all project components are correctly installed.")
         sys.exit(1)
 
     # Import core server
@@ -321,7 +432,14 @@ def main():
         server = get_mcp_server()
         
         # Display server info (after tools and prompts are registered)
-        console.print(Panel(f"[bold green]UML-MCP Server v{MCP_SETTINGS.version}[/bold green]"))
+        from rich.panel import Panel
+        from rich.table import Table
+        get_console().print(Panel(f"[bold green]UML-MCP Server v{MCP_SETTINGS.version}[/bold green]"))
+        
+        # Snapshot the registered names once for the summary and listings
+        tool_names = list(MCP_SETTINGS.tools)
+        prompt_names = list(MCP_SETTINGS.prompts)
+        resource_names = list(MCP_SETTINGS.resources)
         
         # Create a table for server info
         table = Table(title="Server Configuration")
@@ -330,19 +448,18 @@ def main():
         
         table.add_row("Server Name", MCP_SETTINGS.server_name)
         table.add_row("Transport", args.transport)
-        table.add_row("Available Tools", str(len(MCP_SETTINGS.tools)))
-        table.add_row("Available Prompts", str(len(MCP_SETTINGS.prompts)))
-        table.add_row("Available Resources", str(len(MCP_SETTINGS.resources)))
+        table.add_row("Available Tools", str(len(tool_names)))
+        table.add_row("Available Prompts", str(len(prompt_names)))
+        table.add_row("Available Resources", str(len(resource_names)))
         if args.transport == "http":
             table.add_row("Host", args.host)
             table.add_row("Port", str(args.port))
         
-        console.print(table)
+        get_console().print(table)
         
         # Display tools list if requested
-        list_tools = args.list_tools or os.environ.get("LIST_TOOLS", "").lower() == "true"
         if list_tools:
-            display_tools_and_resources(MCP_SETTINGS)
+            display_tools_and_resources(MCP_SETTINGS, tool_names, prompt_names, resource_names, _filtered_tool_registry())
             return
         
         # Start MCP server
@@ -353,6 +470,7 @@ def main():
         logger.critical(f"Server error: {str(e)}", exc_info=True)
     finally:
         logger.info("Server shut down")
+        _LOG_BUFFER.flush()
 
 if __name__ == "__main__":
     main()
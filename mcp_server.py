@@ -8,6 +8,10 @@ A minimal MCP server for generating UML diagrams using FastMCP, Typer, and Rich.
 import os
 import zlib
 import base64
+import hashlib
+import sqlite3
+import functools
+import threading
 from typing import Dict, Any
 
 import typer
@@ -30,36 +34,121 @@ if USE_LOCAL_PLANTUML:
 else:
     PLANTUML_SERVER = os.environ.get("PLANTUML_SERVER", PUBLIC_PLANTUML_SERVER)
 
-
+# URL prefixes for the common output formats, built once from the fixed server URL
+_URL_PREFIXES = {fmt: f"{PLANTUML_SERVER}/{fmt}/" for fmt in ("svg", "png", "txt")}
+
+# PlantUML uses its own base64 alphabet; translate standard base64 output into it
+_PLANTUML_TRANS = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+    b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_",
+)
+
+# Number of encoded diagrams to keep, tunable to the memory budget
+ENCODE_CACHE_SIZE = int(os.environ.get("UML_MCP_ENCODE_CACHE", "1024"))
+
+
+# Optional SQLite file that keeps encoded diagrams across restarts (disabled if unset)
+ENCODE_DB_PATH = os.environ.get("UML_MCP_ENCODE_DB")
+ENCODE_DB_LIMIT = int(os.environ.get("UML_MCP_ENCODE_DB_LIMIT", "10000"))
+# Bump whenever encode_plantuml's output changes, so cached encodings are discarded
+ENCODE_DB_VERSION = 2
+
+_ENCODE_DB = None
+_ENCODE_DB_LOCK = threading.Lock()
+_ENCODE_DB_INSERTS = 0
+
+
+def _get_encode_db():
+    """Open the on-disk encode cache on first use, or return None if disabled."""
+    global _ENCODE_DB, ENCODE_DB_PATH
+    if _ENCODE_DB is None and ENCODE_DB_PATH:
+        try:
+            db = sqlite3.connect(ENCODE_DB_PATH, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA mmap_size=67108864")
+            # Entries written by a different encoder version would be stale URLs, so drop them
+            if db.execute("PRAGMA user_version").fetchone()[0] != ENCODE_DB_VERSION:
+                db.execute("DROP TABLE IF EXISTS enc")
+                db.execute(f"PRAGMA user_version={ENCODE_DB_VERSION}")
+            # Keep the implicit rowid so the oldest entries can be trimmed in insert order
+            db.execute("CREATE TABLE IF NOT EXISTS enc (k BLOB PRIMARY KEY, v TEXT NOT NULL)")
+            _ENCODE_DB = db
+        except sqlite3.Error:
+            # An unusable cache file only costs the speedup, so stop trying
+            ENCODE_DB_PATH = None
+    return _ENCODE_DB
+
+
+def _disk_cached(func):
+    """Look encoded diagrams up in the on-disk cache before computing them."""
+    @functools.wraps(func)
+    def wrapper(text: str) -> str:
+        global _ENCODE_DB_INSERTS
+        if not ENCODE_DB_PATH:
+            return func(text)
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        # Only the sqlite calls share the lock; encoding a miss runs outside it
+        with _ENCODE_DB_LOCK:
+            db = _get_encode_db()
+            if db is not None:
+                try:
+                    row = db.execute("SELECT v FROM enc WHERE k=?", (key,)).fetchone()
+                except sqlite3.Error:
+                    row = None
+                if row is not None:
+                    return row[0]
+        value = func(text)
+        if db is not None:
+            with _ENCODE_DB_LOCK:
+                try:
+                    db.execute("INSERT OR REPLACE INTO enc (k, v) VALUES (?, ?)", (key, value))
+                    _ENCODE_DB_INSERTS += 1
+                    # Trim periodically rather than counting rows on every insert
+                    if _ENCODE_DB_INSERTS % 100 == 0:
+                        db.execute(
+                            "DELETE FROM enc WHERE rowid <= (SELECT MAX(rowid) FROM enc) - ?",
+                            (ENCODE_DB_LIMIT,),
+                        )
+                except sqlite3.Error:
+                    pass
+        return value
+    return wrapper
+
+
+@functools.lru_cache(maxsize=ENCODE_CACHE_SIZE)
+@_disk_cached
 def encode_plantuml(text: str) -> str:
-    """Encode PlantUML text using zlib and base64."""
-    compressed = zlib.compress(text.encode("utf-8"))
-    # Use full compressed data and add ~1 prefix for HUFFMAN encoding
-    encoded = base64.urlsafe_b64encode(compressed[2:-4]).decode("utf-8").rstrip("=")
-    return encoded
+    """Encode PlantUML text using zlib and PlantUML's base64 alphabet."""
+    # Raw DEFLATE (negative wbits) has no zlib header or checksum to strip
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    compressed = compressor.compress(text.encode("utf-8")) + compressor.flush()
+    encoded = base64.b64encode(compressed).translate(_PLANTUML_TRANS)
+    # Padding length follows from the input length, so drop it without scanning
+    padding = -len(compressed) % 3
+    return encoded[:len(encoded) - padding].decode("ascii")
 
 
 def generate_diagram(code: str, fmt: str = "svg") -> Dict[str, Any]:
     """Generate a diagram URL using the PlantUML server."""
     encoded = encode_plantuml(code)
-    # Add ~1 prefix to indicate HUFFMAN encoding
-    url = f"{PLANTUML_SERVER}/{fmt}/~1{encoded}"
+    prefix = _URL_PREFIXES.get(fmt)
+    url = prefix + encoded if prefix else f"{PLANTUML_SERVER}/{fmt}/{encoded}"
     return {"url": url, "code": code}
 
 
-# Create a FastMCP server instance
-server = FastMCP("UML Diagram Generator")
-
-
-# Register an MCP tool to generate a UML diagram
-@server.tool(name="generate_uml", description="Generate a UML diagram using PlantUML")
+# MCP tool to generate a UML diagram
 def generate_uml(diagram_type: str, code: str) -> Dict[str, Any]:
     # For simplicity, the diagram_type parameter is not used.
     return generate_diagram(code)
 
 
-# Register an MCP resource to expose server info
-@server.resource("uml://info")
+# MCP tool to report encoding cache statistics
+def get_cache_stats() -> Dict[str, Any]:
+    return encode_plantuml.cache_info()._asdict()
+
+
+# MCP resource to expose server info
 def get_info() -> Dict[str, Any]:
     return {
         "server": "UML Diagram Generator",
@@ -69,8 +158,7 @@ def get_info() -> Dict[str, Any]:
     }
 
 
-# Register an MCP prompt with a simple template
-@server.prompt(name="simple_prompt", description="Simple prompt for diagram generation")
+# MCP prompt with a simple template
 def simple_prompt(context: Dict[str, Any]) -> GetPromptResult:
     code = context.get("code", "@startuml\nAlice -> Bob: Hello\n@enduml")
     return GetPromptResult(
@@ -79,6 +167,38 @@ def simple_prompt(context: Dict[str, Any]) -> GetPromptResult:
     )
 
 
+def _register_handlers(server: FastMCP) -> None:
+    """Register the tools, resources and prompts on a new server."""
+    server.tool(name="generate_uml", description="Generate a UML diagram using PlantUML")(generate_uml)
+    server.tool(name="get_cache_stats", description="Get PlantUML encoding cache statistics")(get_cache_stats)
+    server.resource("uml://info")(get_info)
+    server.prompt(name="simple_prompt", description="Simple prompt for diagram generation")(simple_prompt)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def _get_server() -> FastMCP:
+    """Return the FastMCP server, creating and registering it on first use."""
+    global _server
+    if _server is None:
+        with _server_lock:
+            # Re-check so concurrent callers don't create a second server
+            if _server is None:
+                server = FastMCP("UML Diagram Generator")
+                _register_handlers(server)
+                _server = server
+    return _server
+
+
+def __getattr__(name: str) -> Any:
+    # `mcp run` / `mcp dev` look up a module-level `server`; build it only when asked for
+    if name == "server":
+        return _get_server()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Set up the CLI using Typer and Rich
 cli = typer.Typer()
 
@@ -88,7 +208,7 @@ def run():
     """Run the MCP server using stdio transport."""
     console = Console()
     console.print("[bold green]Starting UML Diagram Generator MCP Server...[/bold green]")
-    server.run()
+    _get_server().run()
 
 
 @cli.command()
@@ -6,11 +6,17 @@ A minimal MCP server for generating UML diagrams using FastMCP, Typer, and Rich.
 """
 
 import os
-import zlib
-import base64
+import queue
+import atexit
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import functools
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional, Tuple
 
+import httpx
 import typer
 from rich.console import Console
 from rich.table import Table
@@ -19,56 +25,175 @@ from rich.logging import RichHandler
 from mcp.server.fastmcp import FastMCP
 from mcp.types import TextContent, PromptMessage, PromptResult
 
+# PlantUML encoding and its cache are shared with the main server module
+from mcp_server import encode_plantuml
+
 # Configure console and logging
 console = Console()
+_log = logging.getLogger(__name__)
+_log_info = _log.info
 
 # Configuration: Use PlantUML server (can be overridden with env var)
 PLANTUML_SERVER = os.environ.get("PLANTUML_SERVER", "http://www.plantuml.com/plantuml")
 OUTPUT_DIR = os.environ.get("UML_MCP_OUTPUT_DIR", "output")
 
-# Ensure output directory exists
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# URL prefixes for the common output formats, built once from the fixed server URL
+_URL_PREFIXES = {fmt: f"{PLANTUML_SERVER}/{fmt}/" for fmt in ("svg", "png", "txt")}
+
+# Path prefix shared by every saved diagram, joined once
+_OUTPUT_PREFIX = os.path.join(OUTPUT_DIR, "diagram_")
+
+class _RecordQueueHandler(QueueHandler):
+    """Queue handler that passes records through untouched.
+    
+    The stock prepare() formats the message and drops exc_info on the calling thread;
+    keeping the record intact defers formatting to the listener and lets RichHandler
+    still render tracebacks.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+# Queue feeding the Rich console handler, drained by a single listener thread
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener: Optional[QueueListener] = None
+
+@atexit.register
+def _stop_log_listener() -> None:
+    """Flush queued records and stop the listener thread, if it is still running."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
 
 # Setup logging
 def setup_logging(debug: bool = False):
     """Configure logging for the simplified MCP server"""
+    global _log_listener
     level = logging.DEBUG if debug else logging.INFO
     
-    # Create logs directory if it doesn't exist
-    log_dir = "logs"
-    os.makedirs(log_dir, exist_ok=True)
+    # Render records with Rich on a listener thread; request threads only enqueue them
+    if _log_listener is None:
+        console_handler = RichHandler(rich_tracebacks=True)
+        _log_listener = QueueListener(_log_queue, console_handler, respect_handler_level=True)
+        _log_listener.start()
+    for handler in _log_listener.handlers:
+        handler.setLevel(level)
     
-    # Configure handlers
-    console_handler = RichHandler(rich_tracebacks=True)
-    console_handler.setLevel(level)
+    # basicConfig leaves an already configured root logger alone, so apply the level directly
+    logging.getLogger().setLevel(level)
     
     # Configure root logger
     logging.basicConfig(
         level=level,
         format="%(message)s",
         datefmt="[%X]",
-        handlers=[console_handler]
+        handlers=[_RecordQueueHandler(_log_queue)]
     )
     
-    return logging.getLogger(__name__)
+    return _log
+
+# Diagram downloads run in the background so tool calls never wait on the PlantUML server.
+# The workers are daemon threads: pending downloads are dropped at exit instead of holding it up.
+_SAVE_WORKERS = 8
+_SAVE_QUEUE: "queue.SimpleQueue[Tuple[str, str]]" = queue.SimpleQueue()
+_save_workers_started = False
+_save_workers_lock = threading.Lock()
+
+# Most recent download failures keyed by local path, reported by get_save_status
+_FAILED_SAVES: Dict[str, str] = {}
+_FAILED_SAVES_LIMIT = 1024
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+def _get_http_client() -> httpx.Client:
+    """Return the HTTP client shared by the download workers, creating it on first use."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(timeout=30.0)
+        return _http_client
+
+@atexit.register
+def _close_http_client() -> None:
+    """Close the shared HTTP client when the process exits."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path: str) -> None:
+    """Create a directory once per process, the first time something is saved in it."""
+    os.makedirs(path, exist_ok=True)
+
+def _save_diagram(url: str, filepath: str) -> None:
+    """Download a rendered diagram and publish it atomically at filepath."""
+    # Write to a temporary file first so readers never see a partial diagram
+    temp_path = f"{filepath}.part"
+    try:
+        _ensure_dir(os.path.dirname(filepath) or ".")
+        response = _get_http_client().get(url)
+        response.raise_for_status()
+        
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(response.content)
+            os.replace(temp_path, filepath)
+            _FAILED_SAVES.pop(filepath, None)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    except Exception as e:
+        _log.warning("Failed to save diagram to %s: %s", filepath, e)
+        if len(_FAILED_SAVES) >= _FAILED_SAVES_LIMIT:
+            _FAILED_SAVES.pop(next(iter(_FAILED_SAVES)), None)
+        _FAILED_SAVES[filepath] = str(e)
+
+def _save_worker() -> None:
+    """Download queued diagrams until the process exits."""
+    while True:
+        url, filepath = _SAVE_QUEUE.get()
+        _save_diagram(url, filepath)
+
+def _submit_save(url: str, filepath: str) -> None:
+    """Queue a diagram download, starting the worker threads on first use."""
+    global _save_workers_started
+    if not _save_workers_started:
+        with _save_workers_lock:
+            if not _save_workers_started:
+                for i in range(_SAVE_WORKERS):
+                    threading.Thread(target=_save_worker, name=f"diagram-save-{i}", daemon=True).start()
+                _save_workers_started = True
+    _SAVE_QUEUE.put((url, filepath))
 
-# PlantUML encoding function
-def encode_plantuml(text: str) -> str:
-    """Encode PlantUML text using zlib and base64."""
-    compressed = zlib.compress(text.encode("utf-8"))
-    # Strip the first two and last four bytes per PlantUML spec
-    return base64.urlsafe_b64encode(compressed[2:-4]).decode("utf-8")
+# Last formatted timestamp as (epoch second, text); swapped as one tuple so readers never see a torn pair
+_last_timestamp = (0, "")
+
+def _timestamp() -> str:
+    """Return the local time as YYYYmmddHHMMSS, formatting at most once per second."""
+    global _last_timestamp
+    now = int(time.time())
+    second, formatted = _last_timestamp
+    if second != now:
+        formatted = time.strftime("%Y%m%d%H%M%S", time.localtime(now))
+        _last_timestamp = (now, formatted)
+    return formatted
 
 # Function to generate diagrams
 def generate_diagram(code: str, output_format: str = "svg", save_to_file: bool = True) -> Dict[str, Any]:
     """Generate a diagram URL using the PlantUML server."""
-    # Ensure PlantUML markup is present if not provided
-    if "@startuml" not in code:
-        code = f"@startuml\n{code}\n@enduml"
+    # Ensure PlantUML markup is present if not provided; well-formed input starts with
+    # the marker, so only fall back to scanning the whole text when it does not
+    if not code.startswith("@startuml") and "@startuml" not in code:
+        code = "@startuml\n" + code + "\n@enduml"
     
     # Encode the PlantUML code
     encoded = encode_plantuml(code)
-    url = f"{PLANTUML_SERVER}/{output_format}/{encoded}"
+    prefix = _URL_PREFIXES.get(output_format)
+    url = prefix + encoded if prefix else f"{PLANTUML_SERVER}/{output_format}/{encoded}"
     
     result = {
         "url": url,
@@ -77,19 +202,16 @@ def generate_diagram(code: str, output_format: str = "svg", save_to_file: bool =
     }
     
     if save_to_file:
-        # Generate a filename based on the first line of code
-        import hashlib
-        import datetime
-        
-        # Create a hash of the code content to use in the filename
-        code_hash = hashlib.md5(code.encode()).hexdigest()[:8]
-        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-        filename = f"diagram_{timestamp}_{code_hash}.{output_format}"
-        filepath = os.path.join(OUTPUT_DIR, filename)
+        # Create a short hash of the code content to use in the filename;
+        # it only tells files apart, so a 4-byte BLAKE2b digest is enough
+        code_hash = hashlib.blake2b(code.encode("utf-8"), digest_size=4).hexdigest()
+        timestamp = _timestamp()
+        filepath = _OUTPUT_PREFIX + timestamp + "_" + code_hash + "." + output_format
         
+        # The image is downloaded and written in the background, so the file appears at
+        # local_path once that finishes; get_save_status reports whether it did
         result["local_path"] = filepath
-        # Note: In a real implementation, we would download the image from the URL
-        # and save it to the local path, but for simplicity, we just record the path
+        _submit_save(url, filepath)
     
     return result
 
@@ -110,8 +232,7 @@ def generate_uml(diagram_type: str, code: str, output_format: str = "svg") -> Di
     Returns:
         Dictionary containing URL and code
     """
-    logger = logging.getLogger(__name__)
-    logger.info(f"Generating {diagram_type} diagram")
+    _log_info("Generating %s diagram", diagram_type)
     
     return generate_diagram(code, output_format)
 
@@ -130,6 +251,36 @@ def generate_class_diagram(code: str, output_format: str = "svg") -> Dict[str, A
     """
     return generate_uml("class", code, output_format)
 
+# Register a tool to report encoding cache statistics
+@server.tool(name="get_cache_stats", description="Get PlantUML encoding cache statistics")
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get PlantUML encoding cache statistics
+    
+    Returns:
+        Dictionary with cache hits, misses, maxsize and currsize
+    """
+    return encode_plantuml.cache_info()._asdict()
+
+# Register a tool to report whether a background save has finished
+@server.tool(name="get_save_status", description="Check whether a diagram has been saved to local_path")
+def get_save_status(local_path: str) -> Dict[str, Any]:
+    """
+    Check the outcome of a background diagram save
+    
+    Args:
+        local_path: The local_path returned by generate_uml
+        
+    Returns:
+        Dictionary with the status (saved, failed or pending) and any error
+    """
+    error = _FAILED_SAVES.get(local_path)
+    if error is not None:
+        return {"status": "failed", "error": error}
+    if os.path.exists(local_path):
+        return {"status": "saved"}
+    return {"status": "pending"}
+
 # Register an MCP resource to expose server info
 @server.resource("uml://info")
 def get_info() -> Dict[str, Any]:
@@ -237,7 +388,7 @@ def info():
     table.add_row("Supported Diagram Types", ", ".join(diagram_types))
     
     # Display registered tools
-    tools = ["generate_uml", "generate_class_diagram"]
+    tools = ["generate_uml", "generate_class_diagram", "get_cache_stats", "get_save_status"]
     table.add_row("Registered Tools", ", ".join(tools))
     
     console.print(table)
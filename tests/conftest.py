@@ -0,0 +1,17 @@
+"""
+Shared fixtures for the test suite.
+"""
+import os
+import pytest
+from fastapi.testclient import TestClient
+
+# Set testing environment variable
+os.environ["TESTING"] = "true"
+
+from app import app
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client for the FastAPI app, started once per session."""
+    with TestClient(app) as test_client:
+        yield test_client
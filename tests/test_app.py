@@ -1,80 +1,101 @@
 """
 Tests for the FastAPI application.
 """
-import os
-import json
+import asyncio
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import patch, mock_open
+from types import MappingProxyType
+from fastapi import HTTPException
+from unittest.mock import patch
 
-# Set testing environment variable
-os.environ["TESTING"] = "true"
+from app import root, health_check, get_openapi_spec, generate_diagram_endpoint, DiagramRequest
 
-from app import app
+# Plugin manifest returned by the mocked loader
+_MANIFEST = {
+    "schema_version": "v1",
+    "name_for_human": "UML Diagram Generator",
+    "description_for_human": "Generate UML diagrams from text",
+    "auth": {"type": "none"},
+    "api": {"type": "openapi", "url": "https://example.com/openapi.json"},
+    "logo_url": "https://example.com/logo.png"
+}
 
-# Create test client
-client = TestClient(app)
+# Canonical diagram request payload
+_SUCCESS_REQUEST = {
+    "lang": "plantuml",
+    "type": "class",
+    "code": "@startuml\nclass Test\n@enduml",
+    "theme": "default",
+    "output_format": "svg"
+}
+
+# Successful generate_diagram result, read-only so tests cannot change it for each other
+_DIAGRAM_RESULT = MappingProxyType({
+    "code": "@startuml\nclass Test\n@enduml",
+    "url": "https://kroki.io/plantuml/svg/test_url",
+    "playground": "https://playground.example.com",
+    "local_path": "/tmp/diagrams/test.svg"
+})
+
+# Failed generate_diagram result
+_DIAGRAM_ERROR = MappingProxyType({
+    "code": "test code",
+    "error": "Test error message",
+    "url": None,
+    "playground": None,
+    "local_path": None
+})
 
 @pytest.fixture
 def mock_generate_diagram():
     """Mock the generate_diagram function."""
     with patch('app.generate_diagram') as mock_func:
         # Setup mock response
-        mock_func.return_value = {
-            "code": "@startuml\nclass Test\n@enduml",
-            "url": "https://kroki.io/plantuml/svg/test_url",
-            "playground": "https://playground.example.com",
-            "local_path": "/tmp/diagrams/test.svg"
-        }
+        mock_func.return_value = dict(_DIAGRAM_RESULT)
         yield mock_func
 
 @pytest.fixture
 def mock_plugin_manifest():
-    """Mock the plugin manifest file read."""
-    manifest_content = {
-        "schema_version": "v1",
-        "name_for_human": "UML Diagram Generator",
-        "description_for_human": "Generate UML diagrams from text",
-        "auth": {"type": "none"},
-        "api": {"type": "openapi", "url": "https://example.com/openapi.json"},
-        "logo_url": "https://example.com/logo.png"
-    }
-    
-    with patch('builtins.open', mock_open(read_data=json.dumps(manifest_content))):
+    """Mock the plugin manifest loader."""
+    with patch('app._load_manifest', return_value=_MANIFEST):
         yield
 
-def test_root_endpoint():
-    """Test the root endpoint."""
-    response = client.get("/")
-    assert response.status_code == 200
-    assert response.json()["message"] == "Welcome to the UML-MCP API"
-    assert "version" in response.json()
-
-def test_health_check():
-    """Test the health check endpoint."""
-    response = client.get("/health")
-    assert response.status_code == 200
-    assert "status" in response.json()
-    assert "modules_available" in response.json()
+@pytest.mark.parametrize("handler,expected", [
+    (root, {"message": "Welcome to the UML-MCP API", "version": None}),
+    (health_check, {"status": None, "modules_available": None}),
+    # OpenAPI spec should contain standard fields
+    (get_openapi_spec, {"openapi": None, "info": None, "paths": None}),
+], ids=["root", "health", "openapi"])
+def test_get_endpoint(handler, expected):
+    """Test that the metadata endpoints return their expected fields and values."""
+    response = asyncio.run(handler())
+    for key, value in expected.items():
+        assert key in response
+        # None only requires the key; anything else must match exactly
+        if value is not None:
+            assert response[key] == value
 
-def test_generate_diagram_endpoint_success(mock_generate_diagram):
-    """Test successful diagram generation."""
-    # Test data
-    request_data = {
-        "lang": "plantuml",
-        "type": "class",
-        "code": "@startuml\nclass Test\n@enduml",
-        "theme": "default",
-        "output_format": "svg"
-    }
+@pytest.mark.parametrize("result,expected_status,expected_key", [
+    (_DIAGRAM_RESULT, 200, "url"),
+    (_DIAGRAM_ERROR, 400, "detail"),
+], ids=["success", "error"])
+def test_generate_diagram_endpoint(mock_generate_diagram, result, expected_status, expected_key):
+    """Test diagram generation and its error handling."""
+    mock_generate_diagram.return_value = dict(result)
+    request = DiagramRequest(**_SUCCESS_REQUEST)
     
-    # Make request
-    response = client.post("/generate_diagram", json=request_data)
+    # Call the endpoint, turning a raised HTTP error into its response body
+    try:
+        response = asyncio.run(generate_diagram_endpoint(request))
+        status_code = 200
+    except HTTPException as e:
+        response = {"detail": e.detail}
+        status_code = e.status_code
     
     # Verify response
-    assert response.status_code == 200
-    assert "url" in response.json()
-    assert "playground" in response.json()
+    assert status_code == expected_status
+    assert expected_key in response
+    if result.get("error"):
+        assert result["error"] in response["detail"]
     
     # Verify mock was called with correct params
     mock_generate_diagram.assert_called_once()
@@ -83,45 +104,18 @@ def test_generate_diagram_endpoint_success(mock_generate_diagram):
     assert kwargs["code"] == "@startuml\nclass Test\n@enduml"
     assert kwargs["output_format"] == "svg"
 
-def test_generate_diagram_endpoint_error(mock_generate_diagram):
-    """Test error handling in diagram generation endpoint."""
-    # Setup mock to return error
-    mock_generate_diagram.return_value = {
-        "code": "test code",
-        "error": "Test error message",
-        "url": None,
-        "playground": None,
-        "local_path": None
-    }
+def test_generate_diagram_route(client, mock_generate_diagram):
+    """Test that the diagram route validates the request and serializes the response."""
+    response = client.post("/generate_diagram", json=_SUCCESS_REQUEST)
     
-    # Test data
-    request_data = {
-        "lang": "plantuml",
-        "type": "class",
-        "code": "invalid code",
-        "theme": "default"
-    }
-    
-    # Make request
-    response = client.post("/generate_diagram", json=request_data)
-    
-    # Verify response
-    assert response.status_code == 400
-    assert "detail" in response.json()
-    assert "Test error message" in response.json()["detail"]
+    assert response.status_code == 200
+    assert "url" in response.json()
+    mock_generate_diagram.assert_called_once()
 
-def test_plugin_manifest_endpoint(mock_plugin_manifest):
+def test_plugin_manifest_endpoint(client, mock_plugin_manifest):
     """Test the plugin manifest endpoint."""
     response = client.get("/.well-known/ai-plugin.json")
     assert response.status_code == 200
-    assert "schema_version" in response.json()
-    assert "name_for_human" in response.json()
-
-def test_openapi_spec():
-    """Test the OpenAPI specification endpoint."""
-    response = client.get("/openapi.json")
-    assert response.status_code == 200
-    # OpenAPI spec should contain standard fields
-    assert "openapi" in response.json()
-    assert "info" in response.json()
-    assert "paths" in response.json()
\ No newline at end of file
+    body = response.json()
+    assert "schema_version" in body
+    assert "name_for_human" in body
@@ -3,7 +3,7 @@ Tests for the core utilities of UML-MCP.
 """
 import os
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, mock_open
 
 from mcp_core.core.utils import generate_diagram
 from mcp_core.core.config import MCP_SETTINGS
@@ -11,7 +11,7 @@ from mcp_core.core.config import MCP_SETTINGS
 @pytest.fixture
 def mock_kroki_client():
     """Mock the Kroki client for testing."""
-    with patch('mcp.core.utils.kroki_client') as mock_client:
+    with patch('mcp_core.core.utils.kroki_client') as mock_client:
         # Setup mock response
         mock_client.generate_diagram.return_value = {
             "url": "https://kroki.io/plantuml/svg/test_url",
@@ -20,14 +20,21 @@ def mock_kroki_client():
         }
         yield mock_client
 
-def test_generate_diagram_success(mock_kroki_client, tmp_path):
+@pytest.fixture
+def mock_file_io():
+    """Mock directory creation and file writes in the utils module."""
+    with patch('mcp_core.core.utils.os.makedirs') as mock_makedirs, \
+            patch('mcp_core.core.utils.open', mock_open(), create=True) as mock_file:
+        yield mock_makedirs, mock_file
+
+def test_generate_diagram_success(mock_kroki_client, mock_file_io):
     """Test successful diagram generation."""
     # Call generate_diagram with test data
     result = generate_diagram(
         diagram_type="class",
         code="@startuml\nclass Test\n@enduml",
         output_format="svg",
-        output_dir=str(tmp_path)
+        output_dir="diagrams"
     )
     
     # Verify result structure
@@ -42,6 +49,11 @@ def test_generate_diagram_success(mock_kroki_client, tmp_path):
     assert args[0] == "plantuml"  # Backend for class diagrams
     assert "@startuml" in args[1]  # Code contains correct markup
     assert args[2] == "svg"  # Correct output format
+    
+    # Verify the rendered content was written to the local path
+    _, mock_file = mock_file_io
+    mock_file.assert_called_once_with(result["local_path"], 'wb')
+    mock_file().write.assert_called_once_with(b"<svg>test content</svg>")
 
 def test_generate_diagram_unsupported_type():
     """Test generating a diagram with unsupported type."""
@@ -71,26 +83,23 @@ def test_generate_diagram_exception(mock_kroki_client):
     assert "error" in result
     assert "Test error" in result["error"]
 
-def test_output_directory_creation(tmp_path):
+def test_output_directory_creation(mock_kroki_client, mock_file_io):
     """Test that the output directory is created if it doesn't exist."""
-    non_existent_dir = os.path.join(tmp_path, "new_dir")
-    
-    # Directory shouldn't exist initially
-    assert not os.path.exists(non_existent_dir)
+    non_existent_dir = os.path.join("diagrams", "new_dir")
+    mock_kroki_client.generate_diagram.return_value = {
+        "url": "test_url",
+        "content": b"test content",
+        "playground": "test_playground"
+    }
     
     # Call function with non-existent directory
-    with patch('mcp.core.utils.kroki_client') as mock_client:
-        mock_client.generate_diagram.return_value = {
-            "url": "test_url",
-            "content": b"test content",
-            "playground": "test_playground"
-        }
-        generate_diagram(
-            diagram_type="class",
-            code="@startuml\nclass Test\n@enduml",
-            output_format="svg",
-            output_dir=non_existent_dir
-        )
+    generate_diagram(
+        diagram_type="class",
+        code="@startuml\nclass Test\n@enduml",
+        output_format="svg",
+        output_dir=non_existent_dir
+    )
     
-    # Directory should now exist
-    assert os.path.exists(non_existent_dir)
\ No newline at end of file
+    # Directory should have been requested
+    mock_makedirs, _ = mock_file_io
+    mock_makedirs.assert_called_once_with(non_existent_dir, exist_ok=True)
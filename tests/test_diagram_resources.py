@@ -0,0 +1,69 @@
+"""
+Unit tests for diagram resource functions
+"""
+import json
+import pytest
+from unittest.mock import patch
+
+from mcp_core.server.fastmcp_wrapper import FastMCP
+from mcp_core.core.config import MCP_SETTINGS
+from mcp_core.resources.diagram_resources import (
+    register_resources_with_server,
+    get_resource_registry,
+    get_diagram_types,
+    get_diagram_templates,
+    get_diagram_examples,
+    get_output_formats,
+    get_server_info
+)
+
+@pytest.fixture
+def server():
+    """Fixture to create a mock MCP server"""
+    return FastMCP("test")
+
+def test_eager_resources_are_precomputed(server):
+    """Test that eager resources are evaluated once at registration"""
+    with patch.object(MCP_SETTINGS, "eager_resources", True):
+        register_resources_with_server(server)
+
+    resource = server._resources["uml://types"]
+    assert resource() == get_diagram_types()
+    assert resource() is resource()
+
+    # The original function stays in the registry
+    assert get_resource_registry()["uml://types"]["function"] is get_diagram_types
+
+def test_static_resources_are_serialized_once(server):
+    """Test that static resources have their response serialized at registration"""
+    with patch.object(MCP_SETTINGS, "eager_resources", True):
+        register_resources_with_server(server)
+
+    request = {"type": "resource", "path": "uml://types"}
+    assert json.loads(server._static_response(request)) == {"result": get_diagram_types()}
+    assert server._static_response({"type": "resource", "path": "uml://missing"}) is None
+
+def test_live_resources_are_registered_unchanged(server):
+    """Test that resources are registered as-is when eager mode is off"""
+    with patch.object(MCP_SETTINGS, "eager_resources", False):
+        register_resources_with_server(server)
+
+    assert server._resources["uml://types"] is get_diagram_types
+
+def test_server_info_tracks_registered_tools():
+    """Test that cached server info is refreshed when tools change"""
+    with patch.object(MCP_SETTINGS, "tools", ["generate_uml"]):
+        assert get_server_info()["tools"] == ["generate_uml"]
+        assert get_server_info() == get_server_info()
+    with patch.object(MCP_SETTINGS, "tools", ["generate_uml", "generate_class_diagram"]):
+        assert get_server_info()["tools"] == ["generate_uml", "generate_class_diagram"]
+
+def test_resources_follow_overridden_diagram_types():
+    """Test that all diagram type resources read the configured diagram types"""
+    class_only = {"class": MCP_SETTINGS.diagram_types["class"]}
+    with patch.object(MCP_SETTINGS, "diagram_types", class_only):
+        assert list(get_diagram_types()) == ["class"]
+        assert list(get_output_formats()) == ["class"]
+        assert list(get_diagram_templates()) == ["class"]
+        assert list(get_diagram_examples()) == ["class"]
+    assert len(get_diagram_types()) == len(MCP_SETTINGS.diagram_types)
@@ -0,0 +1,54 @@
+"""
+Tests for the mock FastMCP server
+"""
+import io
+import json
+import sys
+import pytest
+
+from mcp_core.server.fastmcp_wrapper import FastMCP
+from mcp_core.core.server import create_mcp_server
+
+@pytest.fixture
+def server():
+    """Fixture to create a mock MCP server with one of each handler"""
+    server = FastMCP("test")
+    server.tool(name="double")(lambda value: value * 2)
+    server.prompt("greeting")(lambda name="World": f"Hello {name}")
+    server.resource("uml://info")(lambda: {"name": "test"})
+    return server
+
+@pytest.mark.parametrize("request_data,expected", [
+    ({"type": "tool", "tool": "double", "args": {"value": 2}}, {"result": 4}),
+    ({"type": "prompt", "prompt": "greeting"}, {"result": "Hello World"}),
+    ({"type": "resource", "path": "uml://info"}, {"result": {"name": "test"}}),
+    ({"tool": "double"}, {"error": "Missing request type"}),
+    ({"type": "unknown"}, {"error": "Unknown request type: unknown"}),
+    ({"type": "tool", "tool": "missing"}, {"error": "Unknown tool: missing"}),
+    ({"type": "resource", "path": "uml://missing"}, {"error": "Unknown resource: uml://missing"}),
+])
+def test_handle_request(server, request_data, expected):
+    """Test dispatching requests to the registered handlers"""
+    assert server._handle_request(request_data) == expected
+
+def test_create_mcp_server_registers_components():
+    """Test that the server registries are populated when the server is created"""
+    server = create_mcp_server()
+
+    assert "generate_uml" in server._tools
+    assert "class_diagram" in server._prompts
+    assert "uml://server-info" in server._resources
+
+def test_run_stdio(server, monkeypatch):
+    """Test that stdio requests are answered one JSON line each until EOF"""
+    requests = b'{"type": "tool", "tool": "double", "args": {"value": 3}}\n\nnot json\n'
+    stdout = io.BytesIO()
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(requests)))
+    monkeypatch.setattr(sys, "stdout", io.TextIOWrapper(stdout))
+
+    server.run()
+
+    lines = stdout.getvalue().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0]) == {"result": 6}
+    assert "error" in json.loads(lines[1])
@@ -2,80 +2,109 @@
 Tests for the Kroki API integration.
 """
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import base64
 import zlib
 import httpx
 
 from kroki.kroki import Kroki, KrokiHTTPError, KrokiConnectionError
 
-@pytest.fixture
-def mock_httpx_client():
+def _reference_encode(text):
+    """Manual compression and encoding to verify deflate_and_encode against."""
+    compress_obj = zlib.compressobj(level=9, method=zlib.DEFLATED, wbits=15,
+                                   memLevel=8, strategy=zlib.Z_DEFAULT_STRATEGY)
+    compressed_data = compress_obj.compress(text.encode('utf-8'))
+    compressed_data += compress_obj.flush()
+    
+    expected = base64.urlsafe_b64encode(compressed_data).decode('ascii')
+    return expected.replace('+', '-').replace('/', '_')
+
+# Reference encodings for the deflate_and_encode cases, computed once
+EXPECTED_ENCODED = {
+    text: _reference_encode(text)
+    for text in ("test text", "graph TD;\nA-->B;", "@startuml\nclass X\n@enduml")
+}
+
+@pytest.fixture(scope="module")
+def kroki():
+    """Kroki client shared by the tests in this module."""
+    client = Kroki()
+    yield client
+    client.client.close()
+
+class _FakeResp:
+    """Minimal stand-in for an httpx response."""
+    status_code = 200
+    content = b"<svg>test content</svg>"
+    url = "https://kroki.io"
+    # Set by a test to make raise_for_status fail
+    error = None
+    
+    def raise_for_status(self):
+        if self.error is not None:
+            raise self.error
+
+@pytest.fixture(scope="module")
+def mock_httpx_client(kroki):
     """Mock the httpx client for testing."""
-    with patch('httpx.Client') as mock_client:
-        # Create mock response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"<svg>test content</svg>"
-        mock_response.raise_for_status = MagicMock()
-        
-        # Make client.get return the mock response
-        client_instance = mock_client.return_value
-        client_instance.get.return_value = mock_response
+    with patch.object(kroki, "client") as client_instance:
+        # Make client.get return the fake response
+        client_instance.get.return_value = _FakeResp()
         
         yield client_instance
 
-def test_kroki_initialization():
+@pytest.fixture(autouse=True)
+def _reset_httpx_client(mock_httpx_client):
+    """Clear calls and side effects left on the shared mock by earlier tests."""
+    mock_httpx_client.reset_mock(side_effect=True)
+    mock_httpx_client.get.return_value.error = None
+    yield
+
+def test_kroki_initialization(kroki):
     """Test Kroki client initialization."""
     # Test with default URL
-    client = Kroki()
-    assert client.base_url == "https://kroki.io"
+    assert kroki.base_url == "https://kroki.io"
     
     # Test with custom URL
     custom_url = "http://custom-kroki.example.com"
     client = Kroki(base_url=custom_url)
     assert client.base_url == custom_url
 
-def test_get_url():
+def test_get_url(kroki):
     """Test URL generation for a diagram."""
-    client = Kroki()
     diagram_type = "plantuml"
     diagram_text = "@startuml\nclass Test\n@enduml"
     output_format = "svg"
     
-    url = client.get_url(diagram_type, diagram_text, output_format)
+    url = kroki.get_url(diagram_type, diagram_text, output_format)
     
     # URL should contain the encoded diagram
     assert url.startswith(f"https://kroki.io/{diagram_type}/{output_format}/")
     
     # Verify encoding by manually encoding the diagram text
-    encoded = client.deflate_and_encode(diagram_text)
+    encoded = kroki.deflate_and_encode(diagram_text)
     assert encoded in url
 
-def test_get_playground_url():
+def test_get_playground_url(kroki):
     """Test playground URL generation."""
-    client = Kroki()
-    
     # Test PlantUML playground
-    plantuml_url = client.get_playground_url("plantuml", "@startuml\nclass Test\n@enduml")
+    plantuml_url = kroki.get_playground_url("plantuml", "@startuml\nclass Test\n@enduml")
     assert plantuml_url is not None
     assert plantuml_url.startswith("https://www.plantuml.com/plantuml/uml/")
     
     # Test Mermaid playground
-    mermaid_url = client.get_playground_url("mermaid", "graph TD;\nA-->B;")
+    mermaid_url = kroki.get_playground_url("mermaid", "graph TD;\nA-->B;")
     assert mermaid_url is not None
     assert mermaid_url.startswith("https://mermaid.live/edit#")
     
     # Test non-existent playground
-    nonexistent_url = client.get_playground_url("nonexistent", "test")
+    nonexistent_url = kroki.get_playground_url("nonexistent", "test")
     assert nonexistent_url is None
 
-def test_render_diagram_success(mock_httpx_client):
+def test_render_diagram_success(kroki, mock_httpx_client):
     """Test successful diagram rendering."""
-    client = Kroki()
-    
     # Test rendering
-    result = client.render_diagram("plantuml", "@startuml\nclass Test\n@enduml", "svg")
+    result = kroki.render_diagram("plantuml", "@startuml\nclass Test\n@enduml", "svg")
     
     # Verify result and mock calls
     assert result == b"<svg>test content</svg>"
@@ -83,37 +112,32 @@ def test_render_diagram_success(mock_httpx_client):
     url_arg = mock_httpx_client.get.call_args[0][0]
     assert url_arg.startswith("https://kroki.io/plantuml/svg/")
 
-def test_render_diagram_http_error(mock_httpx_client):
-    """Test HTTP error handling."""
-    # Setup mock to raise HTTP error
-    mock_response = mock_httpx_client.get.return_value
-    mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+def _raise_http_error(mock_client):
+    """Make the mocked response fail its status check."""
+    mock_response = mock_client.get.return_value
+    mock_response.error = httpx.HTTPStatusError(
         "HTTP Error", request=httpx.Request("GET", "https://kroki.io"), response=mock_response
     )
-    
-    client = Kroki()
-    
-    # Test error handling
-    with pytest.raises(KrokiHTTPError):
-        client.render_diagram("plantuml", "@startuml\nclass Test\n@enduml", "svg")
-
-def test_render_diagram_connection_error(mock_httpx_client):
-    """Test connection error handling."""
-    # Setup mock to raise connection error
-    mock_httpx_client.get.side_effect = httpx.RequestError("Connection error", request=None)
-    
-    client = Kroki()
-    
-    # Test error handling
-    with pytest.raises(KrokiConnectionError):
-        client.render_diagram("plantuml", "@startuml\nclass Test\n@enduml", "svg")
 
-def test_generate_diagram(mock_httpx_client):
+def _raise_connection_error(mock_client):
+    """Make the mocked request fail to connect."""
+    mock_client.get.side_effect = httpx.RequestError("Connection error", request=None)
+
+@pytest.mark.parametrize("fail,expected_error", [
+    (_raise_http_error, KrokiHTTPError),
+    (_raise_connection_error, KrokiConnectionError),
+], ids=["http", "connection"])
+def test_render_diagram_errors(kroki, mock_httpx_client, fail, expected_error):
+    """Test that HTTP and connection failures raise the matching Kroki error."""
+    fail(mock_httpx_client)
+    
+    with pytest.raises(expected_error):
+        kroki.render_diagram("plantuml", "@startuml\nclass Test\n@enduml", "svg")
+
+def test_generate_diagram(kroki, mock_httpx_client):
     """Test the generate_diagram method."""
-    client = Kroki()
-    
     # Test diagram generation
-    result = client.generate_diagram("plantuml", "@startuml\nclass Test\n@enduml", "svg")
+    result = kroki.generate_diagram("plantuml", "@startuml\nclass Test\n@enduml", "svg")
     
     # Verify result structure
     assert "url" in result
@@ -127,39 +151,22 @@ def test_generate_diagram(mock_httpx_client):
     # Verify playground URL
     assert result["playground"].startswith("https://www.plantuml.com/plantuml/uml/")
 
-def test_deflate_and_encode():
+@pytest.mark.parametrize("text", list(EXPECTED_ENCODED))
+def test_deflate_and_encode(kroki, text):
     """Test the deflate_and_encode method."""
-    client = Kroki()
-    text = "test text"
-    
-    encoded = client.deflate_and_encode(text)
+    encoded = kroki.deflate_and_encode(text)
     
     # Verify the result is non-empty and doesn't contain invalid characters
     assert encoded
     assert "+" not in encoded  # + should be replaced with -
     assert "/" not in encoded  # / should be replaced with _
-    
-    # Manual compression and encoding to verify
-    compress_obj = zlib.compressobj(level=9, method=zlib.DEFLATED, wbits=15,
-                                   memLevel=8, strategy=zlib.Z_DEFAULT_STRATEGY)
-    compressed_data = compress_obj.compress(text.encode('utf-8'))
-    compressed_data += compress_obj.flush()
-    
-    expected = base64.urlsafe_b64encode(compressed_data).decode('ascii')
-    expected = expected.replace('+', '-').replace('/', '_')
-    
-    assert encoded == expected
+    assert encoded == EXPECTED_ENCODED[text]
 
-def test_unsupported_diagram_type():
-    """Test error handling for unsupported diagram types."""
-    client = Kroki()
-    
-    with pytest.raises(ValueError, match="Unsupported diagram type"):
-        client.get_url("nonexistent_type", "test code", "svg")
-
-def test_unsupported_output_format():
-    """Test error handling for unsupported output formats."""
-    client = Kroki()
-    
-    with pytest.raises(ValueError, match="Unsupported output format"):
-        client.get_url("plantuml", "test code", "nonexistent_format")
\ No newline at end of file
+@pytest.mark.parametrize("diagram_type,output_format,message", [
+    ("nonexistent_type", "svg", "Unsupported diagram type"),
+    ("plantuml", "nonexistent_format", "Unsupported output format"),
+])
+def test_get_url_rejects(kroki, diagram_type, output_format, message):
+    """Test error handling for unsupported diagram types and output formats."""
+    with pytest.raises(ValueError, match=message):
+        kroki.get_url(diagram_type, "test code", output_format)
@@ -0,0 +1,99 @@
+"""
+Tests for the standalone PlantUML MCP server module
+"""
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+import mcp_server
+
+# The disk-cached encoder beneath the in-memory LRU cache, and the bare encoder beneath that
+DISK_ENCODE = mcp_server.encode_plantuml.__wrapped__
+ENCODE = DISK_ENCODE.__wrapped__
+
+def test_server_is_created_once_on_first_access():
+    """Test that the module-level server is built lazily and then reused"""
+    server = mcp_server.server
+
+    assert server is mcp_server.server
+    tools = asyncio.run(server.list_tools())
+    assert {tool.name for tool in tools} == {"generate_uml", "get_cache_stats"}
+
+@pytest.fixture
+def encode_db(tmp_path, monkeypatch):
+    """Enable the on-disk encode cache against a fresh database file"""
+    monkeypatch.setattr(mcp_server, "ENCODE_DB_PATH", str(tmp_path / "encode.db"))
+    monkeypatch.setattr(mcp_server, "_ENCODE_DB", None)
+    monkeypatch.setattr(mcp_server, "_ENCODE_DB_INSERTS", 0)
+    yield
+    if mcp_server._ENCODE_DB is not None:
+        mcp_server._ENCODE_DB.close()
+
+def _rows():
+    """Count the entries in the on-disk encode cache"""
+    return mcp_server._ENCODE_DB.execute("SELECT COUNT(*) FROM enc").fetchone()[0]
+
+def test_disk_cache_stores_misses_and_serves_hits(encode_db):
+    """Test that a miss is written to the database and later read back from it"""
+    text = "@startuml\nAlice -> Bob\n@enduml"
+    expected = ENCODE(text)
+
+    assert DISK_ENCODE(text) == expected
+    assert _rows() == 1
+
+    # Overwrite the stored value so a hit is distinguishable from recomputing
+    mcp_server._ENCODE_DB.execute("UPDATE enc SET v = 'stored'")
+    assert DISK_ENCODE(text) == "stored"
+
+def test_disk_cache_drops_entries_from_another_encoder_version(encode_db):
+    """Test that rows written by an older encoder are discarded on open"""
+    text = "@startuml\nAlice -> Bob\n@enduml"
+    key = mcp_server.hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    db = sqlite3.connect(mcp_server.ENCODE_DB_PATH)
+    db.execute("CREATE TABLE enc (k BLOB PRIMARY KEY, v TEXT NOT NULL)")
+    db.execute("INSERT INTO enc (k, v) VALUES (?, 'stale')", (key,))
+    db.execute(f"PRAGMA user_version={mcp_server.ENCODE_DB_VERSION - 1}")
+    db.commit()
+    db.close()
+
+    assert DISK_ENCODE(text) == ENCODE(text)
+    version = mcp_server._ENCODE_DB.execute("PRAGMA user_version").fetchone()[0]
+    assert version == mcp_server.ENCODE_DB_VERSION
+
+def test_disk_cache_trims_to_limit(encode_db, monkeypatch):
+    """Test that the oldest entries are dropped once the limit is exceeded"""
+    monkeypatch.setattr(mcp_server, "ENCODE_DB_LIMIT", 10)
+
+    for i in range(100):
+        DISK_ENCODE(f"@startuml\nclass C{i}\n@enduml")
+
+    assert _rows() == 10
+
+def test_disk_cache_disabled_skips_the_lock(monkeypatch):
+    """Test that a disabled cache encodes directly without taking the lock"""
+    lock = MagicMock()
+    monkeypatch.setattr(mcp_server, "ENCODE_DB_PATH", None)
+    monkeypatch.setattr(mcp_server, "_ENCODE_DB_LOCK", lock)
+
+    assert DISK_ENCODE("@startuml\n@enduml") == ENCODE("@startuml\n@enduml")
+    lock.__enter__.assert_not_called()
+
+def test_disk_cache_unopenable_path_falls_back(tmp_path, monkeypatch):
+    """Test that a database that cannot be opened disables the cache"""
+    monkeypatch.setattr(mcp_server, "ENCODE_DB_PATH", str(tmp_path / "missing" / "encode.db"))
+    monkeypatch.setattr(mcp_server, "_ENCODE_DB", None)
+
+    assert DISK_ENCODE("@startuml\n@enduml") == ENCODE("@startuml\n@enduml")
+    assert mcp_server.ENCODE_DB_PATH is None
+    assert mcp_server._ENCODE_DB is None
+
+def test_server_is_created_once_under_concurrent_access(monkeypatch):
+    """Test that concurrent first callers share a single server"""
+    monkeypatch.setattr(mcp_server, "_server", None)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        servers = list(pool.map(lambda _: mcp_server._get_server(), range(16)))
+
+    assert all(server is servers[0] for server in servers)
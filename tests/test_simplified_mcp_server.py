@@ -0,0 +1,102 @@
+"""
+Tests for background diagram saving in the simplified MCP server.
+"""
+import importlib
+import logging
+import queue
+import sys
+from unittest.mock import MagicMock
+
+import httpx
+import mcp.types
+import pytest
+
+@pytest.fixture(scope="module")
+def simplified():
+    """The simplified server module, importable with mcp releases that renamed PromptResult."""
+    with pytest.MonkeyPatch.context() as mp:
+        if not hasattr(mcp.types, "PromptResult"):
+            mp.setattr(mcp.types, "PromptResult", mcp.types.GetPromptResult, raising=False)
+        yield importlib.import_module("simplified_mcp_server")
+        # Drop the module too, so later imports see the real mcp.types
+        sys.modules.pop("simplified_mcp_server", None)
+
+@pytest.fixture
+def http_client(simplified, monkeypatch):
+    """Mock HTTP client used in place of the shared httpx client."""
+    client = MagicMock()
+    monkeypatch.setattr(simplified, "_get_http_client", lambda: client)
+    monkeypatch.setattr(simplified, "_FAILED_SAVES", {})
+    return client
+
+def test_save_diagram_writes_file(simplified, http_client, tmp_path):
+    """Test that a downloaded diagram is published at the returned path"""
+    http_client.get.return_value = httpx.Response(200, content=b"<svg/>", request=httpx.Request("GET", "http://x"))
+    filepath = str(tmp_path / "diagram.svg")
+
+    simplified._save_diagram("http://x", filepath)
+
+    assert (tmp_path / "diagram.svg").read_bytes() == b"<svg/>"
+    assert list(tmp_path.iterdir()) == [tmp_path / "diagram.svg"]
+    assert simplified.get_save_status(filepath) == {"status": "saved"}
+
+def test_save_diagram_reports_http_failure(simplified, http_client, tmp_path, caplog):
+    """Test that a failed download leaves no file and is reported as failed"""
+    http_client.get.return_value = httpx.Response(500, request=httpx.Request("GET", "http://x"))
+    filepath = str(tmp_path / "diagram.svg")
+
+    simplified._save_diagram("http://x", filepath)
+
+    assert list(tmp_path.iterdir()) == []
+    assert "Failed to save diagram" in caplog.text
+    assert simplified.get_save_status(filepath)["status"] == "failed"
+
+def test_save_diagram_removes_temp_file_on_write_error(simplified, http_client, tmp_path, monkeypatch):
+    """Test that the .part file is cleaned up when publishing it fails"""
+    http_client.get.return_value = httpx.Response(200, content=b"<svg/>", request=httpx.Request("GET", "http://x"))
+    filepath = str(tmp_path / "diagram.svg")
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(simplified.os, "replace", failing_replace)
+    simplified._save_diagram("http://x", filepath)
+
+    assert list(tmp_path.iterdir()) == []
+    assert simplified.get_save_status(filepath) == {"status": "failed", "error": "disk full"}
+
+def test_save_status_is_pending_before_the_file_exists(simplified, http_client, tmp_path):
+    """Test that a save that has not finished yet is reported as pending"""
+    assert simplified.get_save_status(str(tmp_path / "diagram.svg")) == {"status": "pending"}
+
+def test_queue_handler_keeps_exception_info(simplified):
+    """Test that queued records still carry exc_info for RichHandler tracebacks"""
+    log_queue = queue.SimpleQueue()
+    handler = simplified._RecordQueueHandler(log_queue)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.makeLogRecord({"msg": "failed %s", "args": ("x",)})
+        record.exc_info = sys.exc_info()
+    handler.emit(record)
+
+    queued = log_queue.get_nowait()
+    assert queued is record
+    assert queued.exc_info[0] is ValueError
+    assert queued.msg == "failed %s"
+
+def test_setup_logging_starts_one_listener(simplified, monkeypatch):
+    """Test that repeated setup_logging calls reuse the same listener thread"""
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", list(root.handlers))
+    monkeypatch.setattr(root, "level", root.level)
+    monkeypatch.setattr(simplified, "_log_listener", None)
+
+    simplified.setup_logging()
+    listener = simplified._log_listener
+    try:
+        simplified.setup_logging(debug=True)
+        assert simplified._log_listener is listener
+        assert listener.handlers[0].level == logging.DEBUG
+    finally:
+        simplified._stop_log_listener()